@@ -0,0 +1,94 @@
+import base64
+import random
+
+from hydra_client import testing
+
+# Synthetic payloads shaped like Hydra's responses. "typical" matches what a
+# default Hydra v1.0 client or session looks like, "large" adds a key set,
+# long URI lists and session claims. Payloads are built from a fixed seed so
+# runs are comparable.
+
+JWK_FIELDS = "alg crv d dp dq e k kid kty n p q qi use x x5c y".split()
+
+
+def _b64(rng, size):
+    data = bytes(rng.getrandbits(8) for _ in range(size))
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def jwk_payload(rng, index):
+    key = dict.fromkeys(JWK_FIELDS, "")
+    key.update(
+        alg="RS256",
+        e="AQAB",
+        kid="key-{:04d}".format(index),
+        kty="RSA",
+        n=_b64(rng, 256),
+        use="sig",
+        x5c=_b64(rng, 768),
+    )
+    return key
+
+
+def client_payload(size="typical", index=0):
+    rng = random.Random(index)
+    payload = testing.client_payload(
+        "client-{:04d}".format(index),
+        grant_types=["authorization_code", "refresh_token"],
+        response_types=["code", "id_token"],
+    )
+    if size == "large":
+        hosts = ["https://app-{:02d}.example.com".format(i) for i in range(50)]
+        payload.update(
+            client_name="Client {}".format(index),
+            redirect_uris=[host + "/callback" for host in hosts],
+            post_logout_redirect_uris=[host + "/logout" for host in hosts],
+            allowed_cors_origins=hosts,
+            audience=["https://api-{:02d}.example.com".format(i) for i in range(20)],
+            contacts=["admin-{:02d}@example.com".format(i) for i in range(10)],
+            scope=" ".join("scope-{:02d}".format(i) for i in range(40)),
+            jwks={"keys": [jwk_payload(rng, i) for i in range(8)]},
+            updated_at="2019-06-11T19:32:34.123456+02:00",
+        )
+    return payload
+
+
+def consent_session_payload(size="typical", index=0):
+    challenge = "challenge-{:04d}".format(index)
+    payload = {
+        "grant_scope": ["openid", "offline"],
+        "grant_access_token_audience": [],
+        "session": None,
+        "remember": True,
+        "remember_for": 0,
+        "consent_request": {
+            "challenge": challenge,
+            "requested_scope": ["openid", "offline"],
+            "requested_access_token_audience": [],
+            "skip": False,
+            "subject": "foobar",
+            "oidc_context": {},
+            "client": client_payload(size, index),
+            "request_url": "http://localhost:4444/oauth2/auth",
+            "login_challenge": "login-" + challenge,
+            "login_session_id": "session-" + challenge,
+            "acr": "",
+        },
+    }
+    if size == "large":
+        claims = {"claim-{:02d}".format(i): "value-{:02d}".format(i) for i in range(30)}
+        payload.update(
+            grant_scope=["scope-{:02d}".format(i) for i in range(40)],
+            session={"access_token": dict(claims), "id_token": dict(claims)},
+        )
+        payload["consent_request"].update(
+            oidc_context={
+                "acr_values": ["urn:acr:1", "urn:acr:2"],
+                "display": "page",
+                "id_token_hint_claims": dict(claims),
+                "login_hint": "foobar@example.com",
+                "ui_locales": ["de", "en"],
+            },
+            context=dict(claims),
+        )
+    return payload
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+
+from hydra_client import HydraAdmin
+from hydra_client.consent import ConsentSession
+from hydra_client.oauth2 import OAuth2Client
+from hydra_client.testing import CassetteReplay
+from hydra_client.utils import filter_none, urljoin
+
+from payloads import client_payload, consent_session_payload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+# Allocations and timings differ between Python versions, so there is a
+# baseline per version
+PYTHON = "{}.{}".format(*sys.version_info[:2])
+CASSETTES = os.path.join(ROOT, "tests", "cassettes")
+
+# Arguments are prepared in batches of at most this many calls, so benchmarks
+# that need a fresh instance per call don't hold all of them at once.
+BATCH_SIZE = 1000
+
+Setup = typing.Callable[[int], typing.List[tuple]]
+
+
+class Benchmark:
+    # Calls `func` with argument tuples from `setup(n)`, which runs outside
+    # of the timed loop.
+
+    def __init__(self, name: str, func: typing.Callable[..., typing.Any], setup: Setup):
+        self.name = name
+        self.func = func
+        self.setup = setup
+
+    def time(self, number: int) -> float:
+        func = self.func
+        elapsed = 0.0
+        while number > 0:
+            batch = self.setup(min(number, BATCH_SIZE))
+            number -= len(batch)
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for args in batch:
+                    func(*args)
+                elapsed += time.perf_counter() - start
+            finally:
+                gc.enable()
+        return elapsed
+
+    def peak(self) -> int:
+        # Peak of the memory allocated during a single call, including what
+        # the call returns
+        (args,) = self.setup(1)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = self.func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+        return peak
+
+    def number(self, min_time: float) -> int:
+        # Number of calls that take at least `min_time`
+        number = 1
+        while True:
+            elapsed = self.time(number)
+            if elapsed >= min_time:
+                return number
+            number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    def run(self, repeat: int, min_time: float, calibration: Benchmark) -> dict:
+        number = self.number(min_time)
+        reference = calibration.number(min_time)
+        # The calibration loop is timed right before every repeat, so both see
+        # the same state of the machine
+        timings, references = [], []
+        for _ in range(repeat):
+            references.append(calibration.time(reference) / reference)
+            timings.append(self.time(number) / number)
+        return {
+            "ns": round(min(timings) * 1e9, 1),
+            "relative": float("{:.4g}".format(min(timings) / min(references))),
+            "peak": self.peak(),
+        }
+
+
+def calibration_loop() -> int:
+    # Pure Python work that benchmark timings are divided by, so they are
+    # comparable between machines of different speed
+    counts: typing.Dict[str, int] = {}
+    for i in range(1000):
+        key = "key-{}".format(i % 50)
+        counts[key] = counts.get(key, 0) + i
+    return len(counts)
+
+
+def repeated(*args: typing.Any) -> Setup:
+    return lambda n: [args] * n
+
+
+CALIBRATION = Benchmark("calibration", calibration_loop, repeated())
+
+
+def replayed(name: str) -> HydraAdmin:
+    # An API serving the responses recorded by the tests from memory
+    return CassetteReplay(os.path.join(CASSETTES, name + ".json")).admin()
+
+
+def benchmarks() -> typing.List[Benchmark]:
+    api = HydraAdmin("http://localhost:4445")
+    result = []
+    for size in ("typical", "large"):
+        client = client_payload(size)
+        session = consent_session_payload(size)
+        result += [
+            Benchmark(
+                "OAuth2Client._from_dict[{}]".format(size),
+                OAuth2Client._from_dict,
+                repeated(client),
+            ),
+            Benchmark(
+                "ConsentSession._from_dict[{}]".format(size),
+                ConsentSession._from_dict,
+                repeated(session),
+            ),
+            Benchmark(
+                "Resource._bind[{}]".format(size),
+                ConsentSession._bind,
+                # Binding skips values that are already bound, so every call
+                # gets a freshly decoded session
+                lambda n, session=session: [
+                    (ConsentSession._from_dict(session), api) for _ in range(n)
+                ],
+            ),
+        ]
+    accept = {
+        "grant_access_token_audience": ["https://api.example.com"],
+        "grant_scope": ["openid", "offline"],
+        "remember": True,
+        "remember_for": None,
+        "session": None,
+    }
+    fields = {"field-{:02d}".format(i): i if i % 2 else None for i in range(50)}
+    result += [
+        Benchmark(
+            "utils.urljoin[typical]",
+            urljoin,
+            repeated("http://localhost:4445/", "/clients", "client-0000"),
+        ),
+        Benchmark(
+            "utils.urljoin[large]",
+            urljoin,
+            repeated(
+                "https://hydra.example.com/admin/",
+                "/oauth2/auth/sessions/",
+                "/consent/",
+                "client-0000",
+            ),
+        ),
+        Benchmark("utils.filter_none[typical]", filter_none, repeated(accept)),
+        Benchmark("utils.filter_none[large]", filter_none, repeated(fields)),
+    ]
+    # Complete API calls on recorded payloads, without the network
+    login = replayed("test_login.test_login_request_accept")
+    clients = replayed("test_oauth2.test_client_list")
+    sessions = replayed("test_consent.test_list_consent_sessions")
+    result += [
+        Benchmark(
+            "HydraAdmin.login_request[cassette]",
+            login.login_request,
+            repeated("af3f599180ca41acad0514326176c03d"),
+        ),
+        Benchmark("HydraAdmin.clients[cassette]", clients.clients, repeated()),
+        Benchmark(
+            "HydraAdmin.consent_sessions[cassette]",
+            lambda subject: list(sessions.consent_sessions(subject, None)),
+            repeated("foobar"),
+        ),
+    ]
+    return result
+
+
+def compare(
+    results: typing.Dict[str, dict], baseline: typing.Dict[str, dict], tolerance: float
+) -> typing.List[typing.Tuple[str, str]]:
+    # Returns (key, message) pairs; timings are compared relative to the
+    # calibration loop
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for key in ("relative", "peak"):
+            if key in expected and result[key] > expected[key] * (1 + tolerance):
+                message = "{} {}: {} (baseline {})".format(
+                    name, key, result[key], expected[key]
+                )
+                regressions.append((key, message))
+    return regressions
+
+
+def main(argv: typing.Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark decoding, binding and URL building of hydra-client"
+    )
+    parser.add_argument("-k", dest="filter", help="only run benchmarks matching this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed growth of the relative timings or peak memory over the baseline",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="also fail on slower timings, not only on higher peak memory",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    baselines: typing.Dict[str, dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    baseline = baselines.get(PYTHON, {}).get("results", {})
+
+    results = {}
+    print(
+        "{:<36} {:>12} {:>10} {:>10} {:>8}".format(
+            "benchmark", "ops/s", "us/op", "peak KiB", "change"
+        )
+    )
+    for benchmark in benchmarks():
+        if args.filter and args.filter not in benchmark.name:
+            continue
+        result = results[benchmark.name] = benchmark.run(
+            args.repeat, args.min_time, CALIBRATION
+        )
+        change = ""
+        expected = baseline.get(benchmark.name, {}).get("relative")
+        if expected:
+            change = "{:+.1%}".format(result["relative"] / expected - 1)
+        print(
+            "{:<36} {:>12,.0f} {:>10.2f} {:>10.2f} {:>8}".format(
+                benchmark.name,
+                1e9 / result["ns"],
+                result["ns"] / 1e3,
+                result["peak"] / 1024,
+                change,
+            )
+        )
+
+    if args.save:
+        # Benchmarks that weren't run keep their baseline
+        baseline.update(results)
+        baselines[PYTHON] = {"python": platform.python_version(), "results": baseline}
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return 0
+
+    if not baseline:
+        print(
+            "No baseline for Python {}, nothing was compared".format(PYTHON),
+            file=sys.stderr,
+        )
+        return 0
+
+    failed = False
+    for key, message in compare(results, baseline, args.tolerance):
+        # Even relative timings vary too much on shared machines to fail the
+        # run on them by default; peak memory is deterministic
+        fatal = key == "peak" or args.strict
+        failed = failed or fatal
+        print(("Regression: " if fatal else "Slower: ") + message, file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,958 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+import attr
+import httpx
+
+from . import exceptions
+from .codec import default_codec, JSONCodec
+from .common import error_data, OpenIDConnectContext
+from .consent import ConsentRequest, ConsentSession
+from .login import LoginRequest, LoginSession
+from .logout import LogoutRequest
+from .metrics import endpoint_template, RequestHook, RequestTracker
+from .model import JSON_HEADERS, Resource
+from .oauth2 import ClientInterner, OAuth2Client
+from .utils import filter_none, urljoin
+from .version import Version
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
+async def gather_concurrently(
+    func: typing.Callable[[T], typing.Awaitable[R]],
+    items: typing.Iterable[T],
+    concurrency: int,
+) -> typing.List[typing.Union[R, Exception]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # As with map_concurrently, errors are returned in place of the result.
+    # No call raises, so gather neither fails early nor leaves calls running.
+    async def call(item: T) -> typing.Union[R, Exception]:
+        async with semaphore:
+            try:
+                return await func(item)
+            except asyncio.CancelledError:
+                # An Exception before Python 3.8
+                raise
+            except Exception as exc:
+                return exc
+
+    return list(await asyncio.gather(*(call(item) for item in items)))
+
+
+class AsyncResource(Resource):
+    __slots__ = ()
+
+    async def _request(  # type: ignore
+        self, method: str, url: str, params: dict = None, json: dict = None
+    ) -> httpx.Response:
+        try:
+            api = self.api_
+            body = None if json is None else api.codec_.dumps(json)
+        except AttributeError:
+            raise exceptions.UnboundResourceError
+        if not api.hooks_:
+            return await self._send(method, url, params, body)
+        endpoint = endpoint_template(api.url_, url)
+        with RequestTracker(api.hooks_, method, endpoint, body) as tracker:
+            tracker.response = await self._send(method, url, params, body)
+        return tracker.response
+
+    async def _send(  # type: ignore
+        self,
+        method: str,
+        url: str,
+        params: typing.Optional[dict],
+        body: typing.Optional[bytes],
+    ) -> httpx.Response:
+        try:
+            response = await self.session_.request(
+                method,
+                url,
+                params=params,
+                content=body,
+                headers=None if body is None else JSON_HEADERS,
+            )
+        except (httpx.NetworkError, httpx.TimeoutException) as exc:
+            raise exceptions.ConnectionError from exc
+        except httpx.HTTPError as exc:
+            raise exceptions.TransportError from exc
+        except AttributeError:
+            raise exceptions.UnboundResourceError
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            wrapper_exc = exceptions.status_map.get(
+                exc.response.status_code, exceptions.HTTPError
+            )
+            raise wrapper_exc from exc
+        return response
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncOAuth2Client(AsyncResource, OAuth2Client):
+    @classmethod
+    async def _list(  # type: ignore
+        cls,
+        api: AsyncHydraAdmin,
+        limit: int = None,
+        offset: int = None,
+        fields: typing.Sequence[str] = None,
+        raw: str = None,
+    ) -> typing.Any:
+        url = urljoin(api.url_, cls.path_)
+        params = filter_none({"limit": limit, "offset": offset})
+        response = await api._request("GET", url, params=params)
+        if raw is not None:
+            return api._decode_raw(response, raw)
+        payload = api._decode(response)
+        decode = cls._decoder(api, fields)
+        return [decode(d) for d in payload]
+
+    @classmethod
+    async def _iter(  # type: ignore
+        cls, api: AsyncHydraAdmin, page_size: int, fields: typing.Sequence[str] = None
+    ) -> typing.AsyncIterator[typing.Union[AsyncOAuth2Client, tuple]]:
+        offset = 0
+        task: typing.Optional[asyncio.Future] = asyncio.ensure_future(
+            cls._list(api, page_size, offset, fields)
+        )
+        try:
+            while task is not None:
+                page = await task
+                task = None
+                if len(page) == page_size:
+                    offset += page_size
+                    task = asyncio.ensure_future(
+                        cls._list(api, page_size, offset, fields)
+                    )
+                for client in page:
+                    yield client
+        finally:
+            if task is not None:
+                task.cancel()
+
+    @classmethod
+    async def create(  # type: ignore
+        cls,
+        api: AsyncHydraAdmin,
+        allowed_cors_origins: typing.List[str] = None,
+        audience: typing.List[str] = None,
+        backchannel_logout_session_required: bool = None,
+        backchannel_logout_uri: str = None,
+        client_id: str = None,
+        client_name: str = None,
+        client_secret: str = None,
+        client_secret_expires_at: int = None,
+        client_uri: str = None,
+        contacts: typing.List[str] = None,
+        frontchannel_logout_session_required: bool = None,
+        frontchannel_logout_uri: str = None,
+        grant_types: typing.List[str] = None,
+        jwks: dict = None,
+        jwks_uri: str = None,
+        logo_uri: str = None,
+        owner: str = None,
+        policy_uri: str = None,
+        post_logout_redirect_uris: typing.List[str] = None,
+        redirect_uris: typing.List[str] = None,
+        redirect_object_signing_alg: str = None,
+        request_uris: typing.List[str] = None,
+        response_uris: typing.List[str] = None,
+        scope: str = None,
+        sector_identifier_uri: str = None,
+        subject_type: str = None,
+        token_endpoint_auth_method: str = None,
+        tos_uri: str = None,
+        userinfo_signed_response_alg: str = None,
+    ) -> AsyncOAuth2Client:
+        url = urljoin(api.url_, cls.path_)
+        data = cls._client_data(
+            allowed_cors_origins,
+            audience,
+            backchannel_logout_session_required,
+            backchannel_logout_uri,
+            client_id,
+            client_name,
+            client_secret,
+            client_secret_expires_at,
+            client_uri,
+            contacts,
+            frontchannel_logout_session_required,
+            frontchannel_logout_uri,
+            grant_types,
+            jwks,
+            jwks_uri,
+            logo_uri,
+            owner,
+            policy_uri,
+            post_logout_redirect_uris,
+            redirect_uris,
+            redirect_object_signing_alg,
+            request_uris,
+            response_uris,
+            scope,
+            sector_identifier_uri,
+            subject_type,
+            token_endpoint_auth_method,
+            tos_uri,
+            userinfo_signed_response_alg,
+        )
+        response = await api._request("POST", url, json=data)
+        return cls._from_dict(api._decode(response), parent=api)
+
+    @classmethod
+    async def _get(  # type: ignore
+        cls,
+        api: AsyncHydraAdmin,
+        client_id: str,
+        fields: typing.Sequence[str] = None,
+        raw: str = None,
+    ) -> typing.Any:
+        url = urljoin(api.url_, cls.path_, client_id)
+        response = await api._request("GET", url)
+        return cls._from_response(api, response, raw, fields)
+
+    @classmethod
+    async def _delete(  # type: ignore
+        cls, api: AsyncHydraAdmin, client_id: str
+    ) -> None:
+        url = urljoin(api.url_, cls.path_, client_id)
+        await api._request("DELETE", url)
+
+    async def update(  # type: ignore
+        self,
+        allowed_cors_origins: typing.List[str] = None,
+        audience: typing.List[str] = None,
+        backchannel_logout_session_required: bool = None,
+        backchannel_logout_uri: str = None,
+        client_id: str = None,
+        client_name: str = None,
+        client_secret: str = None,
+        client_secret_expires_at: int = None,
+        client_uri: str = None,
+        contacts: typing.List[str] = None,
+        frontchannel_logout_session_required: bool = None,
+        frontchannel_logout_uri: str = None,
+        grant_types: typing.List[str] = None,
+        jwks: dict = None,
+        jwks_uri: str = None,
+        logo_uri: str = None,
+        owner: str = None,
+        policy_uri: str = None,
+        post_logout_redirect_uris: typing.List[str] = None,
+        redirect_uris: typing.List[str] = None,
+        redirect_object_signing_alg: str = None,
+        request_uris: typing.List[str] = None,
+        response_uris: typing.List[str] = None,
+        scope: str = None,
+        sector_identifier_uri: str = None,
+        subject_type: str = None,
+        token_endpoint_auth_method: str = None,
+        tos_uri: str = None,
+        userinfo_signed_response_alg: str = None,
+    ) -> AsyncOAuth2Client:
+        data = self._client_data(
+            allowed_cors_origins,
+            audience,
+            backchannel_logout_session_required,
+            backchannel_logout_uri,
+            client_id,
+            client_name,
+            client_secret,
+            client_secret_expires_at,
+            client_uri,
+            contacts,
+            frontchannel_logout_session_required,
+            frontchannel_logout_uri,
+            grant_types,
+            jwks,
+            jwks_uri,
+            logo_uri,
+            owner,
+            policy_uri,
+            post_logout_redirect_uris,
+            redirect_uris,
+            redirect_object_signing_alg,
+            request_uris,
+            response_uris,
+            scope,
+            sector_identifier_uri,
+            subject_type,
+            token_endpoint_auth_method,
+            tos_uri,
+            userinfo_signed_response_alg,
+        )
+        response = await self._request("PUT", self._bound_url(), json=data)
+        return self._updated(self._decode(response))
+
+    async def delete(self) -> None:  # type: ignore
+        await self._request("DELETE", self._bound_url())
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncLoginRequest(AsyncResource, LoginRequest):
+    client: AsyncOAuth2Client = attr.ib(
+        converter=AsyncOAuth2Client._from_dict  # type: ignore
+    )
+    oidc_context: OpenIDConnectContext = attr.ib(
+        converter=OpenIDConnectContext._from_dict  # type: ignore
+    )
+
+    @classmethod
+    async def _get(  # type: ignore
+        cls, api: AsyncHydraAdmin, challenge: str, raw: str = None
+    ) -> AsyncLoginRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = await api._request("GET", url, cls._params(challenge))
+        return cls._from_response(api, response, raw)
+
+    @classmethod
+    async def _accept(  # type: ignore
+        cls,
+        resource: AsyncResource,
+        url: str,
+        challenge: str,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        data = cls._accept_data(
+            subject, acr, context, force_subject_identifier, remember, remember_for
+        )
+        url = urljoin(url, "accept")
+        response = await resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
+        )
+        payload = resource._decode(response)
+        return payload["redirect_to"]
+
+    @classmethod
+    async def _reject(  # type: ignore
+        cls,
+        resource: AsyncResource,
+        url: str,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
+        )
+        response = await resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
+        )
+        payload = resource._decode(response)
+        return payload["redirect_to"]
+
+    async def accept(  # type: ignore
+        self,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        return await self._accept(
+            self,
+            self._bound_url(),
+            self.challenge,
+            subject,
+            acr,
+            context,
+            force_subject_identifier,
+            remember,
+            remember_for,
+        )
+
+    async def reject(  # type: ignore
+        self,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return await self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncLoginSession(AsyncResource, LoginSession):
+    @classmethod
+    async def _invalidate_all(  # type: ignore
+        cls, api: AsyncHydraAdmin, subject: str
+    ) -> None:
+        url = urljoin(api.url_, cls.path_)
+        # This returns 204/201 without any content
+        await api._request("DELETE", url, params=cls._params(subject))
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncConsentRequest(AsyncResource, ConsentRequest):
+    client: AsyncOAuth2Client = attr.ib(
+        converter=AsyncOAuth2Client._from_dict  # type: ignore
+    )
+    oidc_context: OpenIDConnectContext = attr.ib(
+        converter=OpenIDConnectContext._from_dict  # type: ignore
+    )
+
+    @classmethod
+    async def _get(  # type: ignore
+        cls, api: AsyncHydraAdmin, challenge: str, raw: str = None
+    ) -> AsyncConsentRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = await api._request("GET", url, params=cls._params(challenge))
+        return cls._from_response(api, response, raw)
+
+    @classmethod
+    async def _accept(  # type: ignore
+        cls,
+        resource: AsyncResource,
+        url: str,
+        challenge: str,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        data = cls._accept_data(
+            grant_access_token_audience, grant_scope, remember, remember_for, session
+        )
+        url = urljoin(url, "accept")
+        response = await resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
+        )
+        payload = resource._decode(response)
+        return payload["redirect_to"]
+
+    @classmethod
+    async def _reject(  # type: ignore
+        cls,
+        resource: AsyncResource,
+        url: str,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
+        )
+        response = await resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
+        )
+        payload = resource._decode(response)
+        return payload["redirect_to"]
+
+    async def accept(  # type: ignore
+        self,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        return await self._accept(
+            self,
+            self._bound_url(),
+            self.challenge,
+            grant_access_token_audience,
+            grant_scope,
+            remember,
+            remember_for,
+            session,
+        )
+
+    async def reject(  # type: ignore
+        self,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return await self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncConsentSession(AsyncResource, ConsentSession):
+    consent_request: AsyncConsentRequest = attr.ib(
+        converter=AsyncConsentRequest._from_dict  # type: ignore
+    )
+
+    @classmethod
+    async def _list(  # type: ignore
+        cls,
+        api: AsyncHydraAdmin,
+        subject: str,
+        page_size: typing.Optional[int] = 100,
+    ) -> typing.AsyncIterator[AsyncConsentSession]:
+        url = urljoin(api.url_, cls.path_)
+        offset, size = 0, 0
+        while True:
+            params = cls._params(subject)
+            if page_size:
+                params.update(limit=page_size, offset=offset)
+            response = await api._request("GET", url, params=params)
+            session_list = api._decode(response)
+            for consent_session in session_list:
+                yield cls._from_dict(consent_session, parent=api)
+            next_page = cls._next_page(page_size, offset, size, len(session_list))
+            if next_page is None:
+                return
+            offset, size = next_page
+
+    @classmethod
+    async def _revoke(  # type: ignore
+        cls, api: AsyncHydraAdmin, subject: str, client: typing.Optional[str]
+    ) -> None:
+        url = urljoin(api.url_, cls.path_)
+        # This returns 204/201 without any content
+        await api._request("DELETE", url, params=cls._params(subject, client))
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncLogoutRequest(AsyncResource, LogoutRequest):
+    @classmethod
+    async def _get(  # type: ignore
+        cls, api: AsyncHydraAdmin, challenge: str, raw: str = None
+    ) -> AsyncLogoutRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = await api._request("GET", url, cls._params(challenge))
+        if raw is not None:
+            return api._decode_raw(response, raw)
+        # NOTE: we have to inject the challenge here since the endpoint doesn't
+        # return it as it's the case for login/consent.
+        data = api._decode(response)
+        data["challenge"] = challenge
+        return cls._from_dict(data, parent=api)
+
+    @classmethod
+    async def _accept(  # type: ignore
+        cls, resource: AsyncResource, url: str, challenge: str, data: dict = None
+    ) -> str:
+        url = urljoin(url, "accept")
+        response = await resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
+        )
+        payload = resource._decode(response)
+        return payload["redirect_to"]
+
+    @classmethod
+    async def _reject(  # type: ignore
+        cls,
+        resource: AsyncResource,
+        url: str,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> None:
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
+        )
+        # This returns 204/201 without any content
+        await resource._request("PUT", url, params=cls._params(challenge), json=data)
+
+    async def accept(  # type: ignore
+        self,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        data = self._accept_data(
+            subject, acr, context, force_subject_identifier, remember, remember_for
+        )
+        return await self._accept(self, self._bound_url(), self.challenge, data)
+
+    async def reject(  # type: ignore
+        self,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> None:
+        await self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class AsyncVersion(AsyncResource, Version):
+    @classmethod
+    async def _get(cls, api: AsyncHydraAdmin) -> str:  # type: ignore
+        url = urljoin(api.url_, cls.path_)
+        response = await api._request("GET", url)
+        payload = api._decode(response)
+        return payload["version"]
+
+
+class AsyncHydraAdmin(AsyncResource):
+    def __init__(
+        self,
+        url: str,
+        session: httpx.AsyncClient = None,
+        lazy: bool = False,
+        codec: JSONCodec = None,
+        raw: str = None,
+        intern_clients: bool = False,
+        hooks: typing.Iterable[RequestHook] = (),
+    ):
+        self.api_ = self
+        self.url_ = url
+        self.session_ = session or httpx.AsyncClient()
+        # Sessions passed in are closed by their owner
+        self.owns_session_ = session is None
+        self.lazy_ = lazy
+        self.codec_ = codec or default_codec()
+        self.raw_mode_ = raw
+        self.interner_ = ClientInterner(self) if intern_clients else None
+        self.hooks_ = tuple(hooks)
+
+    async def __aenter__(self) -> AsyncHydraAdmin:
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self.owns_session_:
+            await self.session_.aclose()
+
+    @typing.overload
+    async def clients(
+        self, limit: int = None, offset: int = None
+    ) -> typing.List[AsyncOAuth2Client]: ...
+
+    @typing.overload
+    async def clients(
+        self, limit: int = None, offset: int = None, *, fields: typing.Sequence[str]
+    ) -> typing.List[tuple]: ...
+
+    async def clients(
+        self,
+        limit: int = None,
+        offset: int = None,
+        fields: typing.Sequence[str] = None,
+    ) -> typing.Union[typing.List[AsyncOAuth2Client], typing.List[tuple]]:
+        return await AsyncOAuth2Client._list(self, limit, offset, fields)
+
+    async def clients_raw(
+        self, limit: int = None, offset: int = None, raw: str = None
+    ) -> typing.Any:
+        return await AsyncOAuth2Client._list(
+            self, limit, offset, raw=self._raw_mode(raw)
+        )
+
+    async def iter_clients(
+        self, page_size: int = 100, fields: typing.Sequence[str] = None
+    ) -> typing.AsyncIterator[typing.Union[AsyncOAuth2Client, tuple]]:
+        async for client in AsyncOAuth2Client._iter(self, page_size, fields):
+            yield client
+
+    @typing.overload
+    async def client(self, id: str) -> AsyncOAuth2Client: ...
+
+    @typing.overload
+    async def client(self, id: str, fields: typing.Sequence[str]) -> tuple: ...
+
+    async def client(
+        self, id: str, fields: typing.Sequence[str] = None
+    ) -> typing.Union[AsyncOAuth2Client, tuple]:
+        return await AsyncOAuth2Client._get(self, id, fields)
+
+    async def client_raw(self, id: str, raw: str = None) -> typing.Any:
+        return await AsyncOAuth2Client._get(self, id, raw=self._raw_mode(raw))
+
+    async def create_client(
+        self,
+        allowed_cors_origins: typing.List[str] = None,
+        audience: typing.List[str] = None,
+        backchannel_logout_session_required: bool = None,
+        backchannel_logout_uri: str = None,
+        client_id: str = None,
+        client_name: str = None,
+        client_secret: str = None,
+        client_secret_expires_at: int = None,
+        client_uri: str = None,
+        contacts: typing.List[str] = None,
+        frontchannel_logout_session_required: bool = None,
+        frontchannel_logout_uri: str = None,
+        grant_types: typing.List[str] = None,
+        jwks: dict = None,
+        jwks_uri: str = None,
+        logo_uri: str = None,
+        owner: str = None,
+        policy_uri: str = None,
+        post_logout_redirect_uris: typing.List[str] = None,
+        redirect_uris: typing.List[str] = None,
+        redirect_object_signing_alg: str = None,
+        request_uris: typing.List[str] = None,
+        response_uris: typing.List[str] = None,
+        scope: str = None,
+        sector_identifier_uri: str = None,
+        subject_type: str = None,
+        token_endpoint_auth_method: str = None,
+        tos_uri: str = None,
+        userinfo_signed_response_alg: str = None,
+    ) -> AsyncOAuth2Client:
+        return await AsyncOAuth2Client.create(
+            self,
+            allowed_cors_origins,
+            audience,
+            backchannel_logout_session_required,
+            backchannel_logout_uri,
+            client_id,
+            client_name,
+            client_secret,
+            client_secret_expires_at,
+            client_uri,
+            contacts,
+            frontchannel_logout_session_required,
+            frontchannel_logout_uri,
+            grant_types,
+            jwks,
+            jwks_uri,
+            logo_uri,
+            owner,
+            policy_uri,
+            post_logout_redirect_uris,
+            redirect_uris,
+            redirect_object_signing_alg,
+            request_uris,
+            response_uris,
+            scope,
+            sector_identifier_uri,
+            subject_type,
+            token_endpoint_auth_method,
+            tos_uri,
+            userinfo_signed_response_alg,
+        )
+
+    async def create_clients(
+        self, specs: typing.Iterable[dict], concurrency: int = 8
+    ) -> typing.List[typing.Union[AsyncOAuth2Client, Exception]]:
+        return await gather_concurrently(
+            lambda spec: self.create_client(**spec), specs, concurrency
+        )
+
+    async def update_clients(
+        self,
+        updates: typing.Iterable[typing.Tuple[AsyncOAuth2Client, dict]],
+        concurrency: int = 8,
+    ) -> typing.List[typing.Union[AsyncOAuth2Client, Exception]]:
+        return await gather_concurrently(
+            lambda update: update[0].update(**update[1]), updates, concurrency
+        )
+
+    async def delete_clients(
+        self, ids: typing.Iterable[str], concurrency: int = 8
+    ) -> typing.List[typing.Optional[Exception]]:
+        return await gather_concurrently(
+            lambda id: AsyncOAuth2Client._delete(self, id), ids, concurrency
+        )
+
+    async def login_request(self, challenge: str) -> AsyncLoginRequest:
+        return await AsyncLoginRequest._get(self, challenge)
+
+    async def login_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return await AsyncLoginRequest._get(self, challenge, self._raw_mode(raw))
+
+    async def consent_request(self, challenge: str) -> AsyncConsentRequest:
+        return await AsyncConsentRequest._get(self, challenge)
+
+    async def consent_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return await AsyncConsentRequest._get(self, challenge, self._raw_mode(raw))
+
+    async def logout_request(self, challenge: str) -> AsyncLogoutRequest:
+        return await AsyncLogoutRequest._get(self, challenge)
+
+    async def logout_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return await AsyncLogoutRequest._get(self, challenge, self._raw_mode(raw))
+
+    async def accept_login(
+        self,
+        challenge: str,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        return await AsyncLoginRequest._accept(
+            self,
+            urljoin(self.url_, AsyncLoginRequest.path_),
+            challenge,
+            subject,
+            acr,
+            context,
+            force_subject_identifier,
+            remember,
+            remember_for,
+        )
+
+    async def reject_login(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return await AsyncLoginRequest._reject(
+            self,
+            urljoin(self.url_, AsyncLoginRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    async def accept_consent(
+        self,
+        challenge: str,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        return await AsyncConsentRequest._accept(
+            self,
+            urljoin(self.url_, AsyncConsentRequest.path_),
+            challenge,
+            grant_access_token_audience,
+            grant_scope,
+            remember,
+            remember_for,
+            session,
+        )
+
+    async def reject_consent(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return await AsyncConsentRequest._reject(
+            self,
+            urljoin(self.url_, AsyncConsentRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    async def accept_logout(self, challenge: str) -> str:
+        return await AsyncLogoutRequest._accept(
+            self, urljoin(self.url_, AsyncLogoutRequest.path_), challenge
+        )
+
+    async def reject_logout(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> None:
+        await AsyncLogoutRequest._reject(
+            self,
+            urljoin(self.url_, AsyncLogoutRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    async def consent_sessions(
+        self, subject: str, page_size: typing.Optional[int] = 100
+    ) -> typing.AsyncIterator[AsyncConsentSession]:
+        async for consent_session in AsyncConsentSession._list(
+            self, subject, page_size
+        ):
+            yield consent_session
+
+    async def revoke_consent_sessions(self, subject: str, client: str = None) -> None:
+        await AsyncConsentSession._revoke(self, subject, client)
+
+    async def invalidate_login_sessions(self, subject: str) -> None:
+        await AsyncLoginSession._invalidate_all(self, subject)
+
+    def restore(self, data: bytes) -> AsyncResource:
+        # Rebuilds a model saved with its dumps() method, without a request
+        return self._restore(
+            data,
+            (
+                AsyncConsentRequest,
+                AsyncConsentSession,
+                AsyncLoginRequest,
+                AsyncLoginSession,
+                AsyncLogoutRequest,
+                AsyncOAuth2Client,
+            ),
+        )
+
+    async def version(self) -> str:
+        return await AsyncVersion._get(self)
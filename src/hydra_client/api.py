@@ -3,26 +3,115 @@ import typing
 import attr
 import requests
 
+from .codec import default_codec, JSONCodec
 from .model import Resource
+from .cache import ClientCache, SharedClientCache
 from .consent import ConsentRequest, ConsentSession
 from .login import LoginRequest, LoginSession
 from .logout import LogoutRequest
-from .oauth2 import OAuth2Client
+from .metrics import RequestHook
+from .profiler import CallProfiler, profiled
+from .oauth2 import ClientInterner, OAuth2Client
+from .utils import map_concurrently, urljoin
 from .version import Version
 
 
 class HydraAdmin(Resource):
-    def __init__(self, url: str, session: requests.Session = None):
+    def __init__(
+        self,
+        url: str,
+        session: requests.Session = None,
+        cache: typing.Union[ClientCache, SharedClientCache] = None,
+        lazy: bool = False,
+        codec: JSONCodec = None,
+        raw: str = None,
+        intern_clients: bool = False,
+        hooks: typing.Iterable[RequestHook] = (),
+        profiler: CallProfiler = None,
+    ):
+        self.api_ = self
         self.url_ = url
         self.session_ = session or requests.Session()
+        self.cache_ = cache
+        self.lazy_ = lazy
+        self.codec_ = codec or default_codec()
+        self.raw_mode_ = raw
+        self.interner_ = ClientInterner(self) if intern_clients else None
+        self.hooks_ = tuple(hooks)
+        self.profiler_ = profiler
 
+    @typing.overload
     def clients(
         self, limit: int = None, offset: int = None
-    ) -> typing.List[OAuth2Client]:
-        return OAuth2Client._list(self, limit, offset)
+    ) -> typing.List[OAuth2Client]: ...
+
+    @typing.overload
+    def clients(
+        self, limit: int = None, offset: int = None, *, fields: typing.Sequence[str]
+    ) -> typing.List[tuple]: ...
+
+    @profiled
+    def clients(
+        self,
+        limit: int = None,
+        offset: int = None,
+        fields: typing.Sequence[str] = None,
+    ) -> typing.Union[typing.List[OAuth2Client], typing.List[tuple]]:
+        return OAuth2Client._list(self, limit, offset, fields)
+
+    @profiled
+    def clients_raw(
+        self, limit: int = None, offset: int = None, raw: str = None
+    ) -> typing.Any:
+        return OAuth2Client._list(self, limit, offset, raw=self._raw_mode(raw))
+
+    def iter_clients(
+        self,
+        page_size: int = 100,
+        fields: typing.Sequence[str] = None,
+        stream: bool = False,
+    ) -> typing.Iterator[typing.Union[OAuth2Client, tuple]]:
+        yield from OAuth2Client._iter(self, page_size, fields=fields, stream=stream)
+
+    def export_clients(
+        self,
+        page_size: int = 500,
+        concurrency: int = 4,
+        ndjson: bool = False,
+        fields: typing.Sequence[str] = None,
+        stream: bool = False,
+    ) -> typing.Iterator[typing.Union[OAuth2Client, tuple, str]]:
+        if ndjson:
+            yield from OAuth2Client._export_ndjson(self, page_size, concurrency, stream)
+        else:
+            yield from OAuth2Client._iter(self, page_size, concurrency, fields, stream)
+
+    @typing.overload
+    def client(self, id: str) -> OAuth2Client: ...
 
-    def client(self, id: str) -> OAuth2Client:
-        return OAuth2Client._get(self, id)
+    @typing.overload
+    def client(self, id: str, fields: typing.Sequence[str]) -> tuple: ...
+
+    @profiled
+    def client(
+        self, id: str, fields: typing.Sequence[str] = None
+    ) -> typing.Union[OAuth2Client, tuple]:
+        # Projections bypass the cache, which only holds complete clients
+        if self.cache_ is None or fields is not None:
+            return OAuth2Client._get(self, id, fields)
+        client = self.cache_.get(id)
+        if client is None:
+            client = OAuth2Client._get(self, id)
+            self.cache_.set(client)
+        elif getattr(client, "parent_", None) is None:
+            # Shared caches return clients decoded from another process
+            client._bind(self)
+        return client
+
+    @profiled
+    def client_raw(self, id: str, raw: str = None) -> typing.Any:
+        # Raw payloads bypass the cache as well
+        return OAuth2Client._get(self, id, raw=self._raw_mode(raw))
 
     def create_client(
         self,
@@ -56,7 +145,7 @@ class HydraAdmin(Resource):
         tos_uri: str = None,
         userinfo_signed_response_alg: str = None,
     ) -> OAuth2Client:
-        return OAuth2Client.create(
+        client = OAuth2Client.create(
             self,
             allowed_cors_origins,
             audience,
@@ -88,18 +177,169 @@ class HydraAdmin(Resource):
             tos_uri,
             userinfo_signed_response_alg,
         )
+        if self.cache_ is not None:
+            self.cache_.set(client)
+        return client
+
+    def create_clients(
+        self, specs: typing.Iterable[dict], concurrency: int = 8
+    ) -> typing.List[typing.Union[OAuth2Client, Exception]]:
+        return map_concurrently(
+            lambda spec: self.create_client(**spec), specs, concurrency
+        )
+
+    def update_clients(
+        self,
+        updates: typing.Iterable[typing.Tuple[OAuth2Client, dict]],
+        concurrency: int = 8,
+    ) -> typing.List[typing.Union[OAuth2Client, Exception]]:
+        return map_concurrently(
+            lambda update: update[0].update(**update[1]), updates, concurrency
+        )
+
+    def delete_clients(
+        self, ids: typing.Iterable[str], concurrency: int = 8
+    ) -> typing.List[typing.Optional[Exception]]:
+        return map_concurrently(
+            lambda id: OAuth2Client._delete(self, id), ids, concurrency
+        )
 
+    @profiled
     def login_request(self, challenge: str) -> LoginRequest:
         return LoginRequest._get(self, challenge)
 
+    @profiled
+    def login_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return LoginRequest._get(self, challenge, self._raw_mode(raw))
+
+    @profiled
     def consent_request(self, challenge: str) -> ConsentRequest:
         return ConsentRequest._get(self, challenge)
 
+    @profiled
+    def consent_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return ConsentRequest._get(self, challenge, self._raw_mode(raw))
+
+    @profiled
     def logout_request(self, challenge: str) -> LogoutRequest:
         return LogoutRequest._get(self, challenge)
 
-    def consent_sessions(self, subject: str) -> typing.Iterator[ConsentSession]:
-        yield from ConsentSession._list(self, subject)
+    @profiled
+    def logout_request_raw(self, challenge: str, raw: str = None) -> typing.Any:
+        return LogoutRequest._get(self, challenge, self._raw_mode(raw))
+
+    def accept_login(
+        self,
+        challenge: str,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        return LoginRequest._accept(
+            self,
+            urljoin(self.url_, LoginRequest.path_),
+            challenge,
+            subject,
+            acr,
+            context,
+            force_subject_identifier,
+            remember,
+            remember_for,
+        )
+
+    def reject_login(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return LoginRequest._reject(
+            self,
+            urljoin(self.url_, LoginRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    def accept_consent(
+        self,
+        challenge: str,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        return ConsentRequest._accept(
+            self,
+            urljoin(self.url_, ConsentRequest.path_),
+            challenge,
+            grant_access_token_audience,
+            grant_scope,
+            remember,
+            remember_for,
+            session,
+        )
+
+    def reject_consent(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return ConsentRequest._reject(
+            self,
+            urljoin(self.url_, ConsentRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    def accept_logout(self, challenge: str) -> str:
+        return LogoutRequest._accept(
+            self, urljoin(self.url_, LogoutRequest.path_), challenge
+        )
+
+    def reject_logout(
+        self,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> None:
+        LogoutRequest._reject(
+            self,
+            urljoin(self.url_, LogoutRequest.path_),
+            challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
+    @profiled
+    def consent_sessions(
+        self, subject: str, page_size: typing.Optional[int] = 100
+    ) -> typing.Iterator[ConsentSession]:
+        yield from ConsentSession._list(self, subject, page_size)
 
     def revoke_consent_sessions(self, subject: str, client: str = None) -> None:
         ConsentSession._revoke(self, subject, client)
@@ -107,5 +347,20 @@ class HydraAdmin(Resource):
     def invalidate_login_sessions(self, subject: str) -> None:
         LoginSession._invalidate_all(self, subject)
 
+    def restore(self, data: bytes) -> Resource:
+        # Rebuilds a model saved with its dumps() method, without a request
+        return self._restore(
+            data,
+            (
+                ConsentRequest,
+                ConsentSession,
+                LoginRequest,
+                LoginSession,
+                LogoutRequest,
+                OAuth2Client,
+            ),
+        )
+
+    @profiled
     def version(self) -> str:
         return Version._get(self)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+from .oauth2 import OAuth2Client
+
+if typing.TYPE_CHECKING:
+    from .api import HydraAdmin
+
+
+class ClientCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[
+            str, typing.Tuple[float, OAuth2Client]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, client_id: str) -> typing.Optional[OAuth2Client]:
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(client_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(client_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, client: OAuth2Client) -> None:
+        with self._lock:
+            expires = time.monotonic() + self.ttl
+            self._entries[client.client_id] = (expires, client)
+            self._entries.move_to_end(client.client_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, client_id: str) -> None:
+        with self._lock:
+            self._entries.pop(client_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedClientCache:
+    # Backed by an SQLite database in WAL mode, so it can be shared by all
+    # workers of a pre-fork server. Placing the file on a tmpfs such as
+    # /dev/shm keeps it in memory. Hit/miss counters are per process.
+
+    def __init__(self, path: str, ttl: float = 300.0):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared across threads or inherited by
+        # forked worker processes.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            # Only the owner may read the database; SQLite creates the WAL
+            # files with the same permissions.
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS clients (
+                    client_id TEXT PRIMARY KEY,
+                    expires REAL NOT NULL,
+                    data BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                );
+                """)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self) -> typing.Iterator[sqlite3.Connection]:
+        # The connection is in autocommit mode, so statements that belong
+        # together need an explicit transaction.
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def __len__(self) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM clients WHERE expires > ?", (time.time(),)
+        )
+        return row.fetchone()[0]
+
+    def get(self, client_id: str) -> typing.Optional[OAuth2Client]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT data FROM clients WHERE client_id = ? AND expires > ?",
+                (client_id, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return OAuth2Client._from_dict(json.loads(row[0]))
+
+    def set(self, client: OAuth2Client) -> None:
+        self._set_many([client])
+
+    def _set_many(
+        self, clients: typing.Iterable[OAuth2Client], purge: bool = False
+    ) -> None:
+        # With purge, expired entries of clients that are gone are deleted.
+        # Secrets are never written to the shared file.
+        rows = [
+            (c.client_id, json.dumps(self._row_data(c), separators=(",", ":")))
+            for c in clients
+        ]
+        now = time.time()
+        expires = now + self.ttl
+        with self._transaction() as connection:
+            if purge:
+                connection.execute("DELETE FROM clients WHERE expires <= ?", (now,))
+            connection.executemany(
+                "INSERT OR REPLACE INTO clients VALUES (?, ?, ?)",
+                [(client_id, expires, data) for client_id, data in rows],
+            )
+
+    @staticmethod
+    def _row_data(client: OAuth2Client) -> dict:
+        data = client._to_dict()
+        data.pop("client_secret", None)
+        return data
+
+    def invalidate(self, client_id: str) -> None:
+        self._connection().execute(
+            "DELETE FROM clients WHERE client_id = ?", (client_id,)
+        )
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM clients")
+
+    def refresh(self, api: HydraAdmin, interval: float, page_size: int = 500) -> bool:
+        # Every worker may call this periodically; only the one that claims
+        # the refresh for the current interval fetches the clients.
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute("INSERT OR IGNORE INTO meta VALUES ('refreshed_at', 0)")
+            claimed = connection.execute(
+                "UPDATE meta SET value = ? WHERE key = 'refreshed_at' AND value <= ?",
+                (now, now - interval),
+            ).rowcount
+        if claimed:
+            # Clients are fetched before the write transaction starts, so the
+            # other workers aren't locked out while the pages arrive.
+            self._set_many(api.iter_clients(page_size), purge=True)
+        return bool(claimed)
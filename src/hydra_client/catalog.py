@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+import threading
+import typing
+
+from .oauth2 import OAuth2Client
+
+if typing.TYPE_CHECKING:
+    from .registry import OAuth2ClientRegistry
+
+# Most indexed values belong to a single client, so a bucket holds a bare
+# client id until a second client shares the value and only then a set.
+Bucket = typing.Union[str, typing.Set[str]]
+
+
+class ClientCatalog:
+    indexed_fields = (
+        "owner",
+        "redirect_uris",
+        "post_logout_redirect_uris",
+        "audience",
+        "grant_types",
+    )
+
+    def __init__(self, clients: typing.Iterable[OAuth2Client] = ()):
+        self._clients: typing.Dict[str, OAuth2Client] = {}
+        # The (field, value) pairs each client was indexed under. Clients can
+        # be changed in place by update(), so they are removed by these keys
+        # rather than by their current values.
+        self._keys: typing.Dict[str, typing.Tuple[typing.Tuple[str, str], ...]] = {}
+        self._indexes: typing.Dict[str, typing.Dict[str, Bucket]] = {
+            field: {} for field in self.indexed_fields
+        }
+        # A catalog fed by a registry is changed from its refresh thread
+        # while others look clients up. Buckets are changed in place, so
+        # lookups take the lock as well. add() removes the client's old
+        # entry while holding it.
+        self._lock = threading.RLock()
+        for client in clients:
+            self.add(client)
+
+    @classmethod
+    def from_registry(cls, registry: OAuth2ClientRegistry) -> ClientCatalog:
+        catalog = cls(registry)
+        registry.subscribe(catalog.apply)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, client_id: object) -> bool:
+        return client_id in self._clients
+
+    def get(self, client_id: str) -> typing.Optional[OAuth2Client]:
+        return self._clients.get(client_id)
+
+    def add(self, client: OAuth2Client) -> None:
+        client_id = sys.intern(client.client_id)
+        with self._lock:
+            if client_id in self._clients:
+                self.remove(client_id)
+            self._clients[client_id] = client
+            keys = []
+            for field, index in self._indexes.items():
+                for value in self._values(client, field):
+                    value = sys.intern(value)
+                    keys.append((field, value))
+                    bucket = index.get(value)
+                    if bucket is None:
+                        index[value] = client_id
+                    elif isinstance(bucket, str):
+                        index[value] = {bucket, client_id}
+                    else:
+                        bucket.add(client_id)
+            self._keys[client_id] = tuple(keys)
+
+    def remove(self, client_id: str) -> None:
+        with self._lock:
+            if self._clients.pop(client_id, None) is None:
+                return
+            for field, value in self._keys.pop(client_id):
+                index = self._indexes[field]
+                bucket = index.get(value)
+                if isinstance(bucket, set):
+                    bucket.discard(client_id)
+                    if len(bucket) == 1:
+                        index[value] = bucket.pop()
+                elif bucket == client_id:
+                    del index[value]
+
+    def apply(
+        self, old: typing.Optional[OAuth2Client], new: typing.Optional[OAuth2Client]
+    ) -> None:
+        if new is not None:
+            self.add(new)
+        elif old is not None:
+            self.remove(old.client_id)
+
+    def find(self, **criteria: str) -> typing.List[OAuth2Client]:
+        for field in criteria:
+            if field not in self._indexes:
+                raise TypeError("{} is not an indexed field".format(field))
+        matches: typing.Optional[typing.Set[str]] = None
+        with self._lock:
+            for field, value in criteria.items():
+                bucket = self._indexes[field].get(value)
+                if bucket is None:
+                    return []
+                ids = {bucket} if isinstance(bucket, str) else bucket
+                matches = set(ids) if matches is None else matches & ids
+            if matches is None:
+                matches = set(self._clients)
+            return [self._clients[client_id] for client_id in sorted(matches)]
+
+    @staticmethod
+    def _values(client: OAuth2Client, field: str) -> typing.Set[str]:
+        value = getattr(client, field)
+        if value is None:
+            return set()
+        if isinstance(value, str):
+            return {value}
+        return set(value)
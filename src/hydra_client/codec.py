@@ -0,0 +1,89 @@
+import json
+import re
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        return json.loads(data)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+def default_codec() -> JSONCodec:
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+STRUCTURE_RE = re.compile(rb'[\[\]{},"]')
+STRING_RE = re.compile(rb'["\\]')
+
+
+def iter_array(
+    chunks: typing.Iterable[bytes], loads: typing.Callable[[bytes], typing.Any]
+) -> typing.Iterator[typing.Any]:
+    # Splits a JSON array into its elements as the chunks arrive and decodes
+    # each element on its own, so only the element being received is held
+    # in memory. The scanner only tracks nesting depth and string state.
+    depth = 0
+    in_string = False
+    escaped = False
+    element = bytearray()
+    for chunk in chunks:
+        start = pos = 0
+        if escaped and chunk:
+            # The escaped character is the first one of this chunk
+            escaped = False
+            pos = 1
+        while True:
+            if in_string:
+                match = STRING_RE.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == b"\\":
+                    if pos == len(chunk):
+                        escaped = True
+                        break
+                    pos += 1
+                else:
+                    in_string = False
+                continue
+
+            match = STRUCTURE_RE.search(chunk, pos)
+            if match is None:
+                break
+            token, pos = match.group(), match.end()
+            if token == b'"':
+                in_string = True
+            elif token in b"[{":
+                depth += 1
+                if depth == 1:
+                    start = pos
+            elif token == b"," and depth == 1 or token in b"]}" and depth == 1:
+                element += chunk[start : match.start()]
+                if element.strip():
+                    yield loads(bytes(element))
+                element.clear()
+                start = pos
+                if token != b",":
+                    depth -= 1
+            elif token in b"]}":
+                depth -= 1
+        if depth > 0:
+            element += chunk[start:]
@@ -3,9 +3,29 @@ import typing
 import attr
 
 from .model import Entity
+from .utils import filter_none
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+def error_data(
+    error: str = None,
+    error_debug: str = None,
+    error_description: str = None,
+    error_hint: str = None,
+    status_code: int = None,
+) -> dict:
+    # The body of reject requests for login, consent and logout challenges
+    return filter_none(
+        {
+            "error": error,
+            "error_debug": error_debug,
+            "error_description": error_description,
+            "error_hint": error_hint,
+            "status_code": status_code,
+        }
+    )
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class OpenIDConnectContext(Entity):
     acr_values: typing.List[str] = attr.ib(factory=list)
     display: str = ""
@@ -4,7 +4,7 @@ import typing
 
 import attr
 
-from .common import OpenIDConnectContext
+from .common import error_data, OpenIDConnectContext
 from .model import Entity, optional_from_dict, Resource
 from .oauth2 import OAuth2Client
 from .utils import filter_none, urljoin
@@ -13,7 +13,7 @@ if typing.TYPE_CHECKING:
     from .api import HydraAdmin
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class ConsentRequest(Resource):
     acr: str
     challenge: str
@@ -32,31 +32,26 @@ class ConsentRequest(Resource):
     skip: bool
     subject: str
 
-    url_ = "/oauth2/auth/requests/consent"
+    path_ = "/oauth2/auth/requests/consent"
 
     def _post_bind(self) -> None:
-        self.url_ = urljoin(self.parent_.url_, self.url_)
+        self.url_ = urljoin(self.api_.url_, self.path_)
 
     @classmethod
     def _params(cls, challenge: str) -> dict:
         return {"consent_challenge": challenge}
 
     @classmethod
-    def _get(cls, api: HydraAdmin, challenge: str) -> ConsentRequest:
-        url = urljoin(api.url_, cls.url_)
-        response = api._request("GET", url, params=cls._params(challenge))
-        payload = response.json()
-        return cls._from_dict(payload, parent=api)
-
-    def accept(
-        self,
+    def _accept_data(
+        cls,
         grant_access_token_audience: typing.Iterable[str] = None,
         grant_scope: typing.Iterable[str] = None,
         remember: bool = False,
         remember_for: int = None,
         session: dict = None,
-    ) -> str:
-        data = filter_none(
+    ) -> dict:
+        # The body of accept requests, shared with the asyncio API
+        return filter_none(
             {
                 "grant_access_token_audience": grant_access_token_audience,
                 "grant_scope": grant_scope,
@@ -65,45 +60,103 @@ class ConsentRequest(Resource):
                 "session": session,
             }
         )
-        url = urljoin(self.url_, "accept")
-        response = self._request(
-            "PUT", url, params=self._params(self.challenge), json=data
+
+    @classmethod
+    def _get(cls, api: HydraAdmin, challenge: str, raw: str = None) -> ConsentRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = api._request("GET", url, params=cls._params(challenge))
+        return cls._from_response(api, response, raw)
+
+    @classmethod
+    def _accept(
+        cls,
+        resource: Resource,
+        url: str,
+        challenge: str,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        data = cls._accept_data(
+            grant_access_token_audience, grant_scope, remember, remember_for, session
+        )
+        url = urljoin(url, "accept")
+        response = resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
         )
-        payload = response.json()
+        payload = resource._decode(response)
         return payload["redirect_to"]
 
-    def reject(
-        self,
+    @classmethod
+    def _reject(
+        cls,
+        resource: Resource,
+        url: str,
+        challenge: str,
         error: str = None,
         error_debug: str = None,
         error_description: str = None,
         error_hint: str = None,
         status_code: int = None,
     ) -> str:
-        url = urljoin(self.url_, "reject")
-        data = filter_none(
-            {
-                "error": error,
-                "error_debug": error_debug,
-                "error_description": error_description,
-                "error_hint": error_hint,
-                "status_code": status_code,
-            }
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
         )
-        response = self._request(
-            "PUT", url, params=self._params(self.challenge), json=data
+        response = resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
         )
-        payload = response.json()
+        payload = resource._decode(response)
         return payload["redirect_to"]
 
+    def accept(
+        self,
+        grant_access_token_audience: typing.Iterable[str] = None,
+        grant_scope: typing.Iterable[str] = None,
+        remember: bool = False,
+        remember_for: int = None,
+        session: dict = None,
+    ) -> str:
+        return self._accept(
+            self,
+            self._bound_url(),
+            self.challenge,
+            grant_access_token_audience,
+            grant_scope,
+            remember,
+            remember_for,
+            session,
+        )
+
+    def reject(
+        self,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class ConsentRequestSession(Entity):
     access_token: dict
     id_token: dict
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class ConsentSession(Resource):
     consent_request: ConsentRequest = attr.ib(
         converter=ConsentRequest._from_dict  # type: ignore
@@ -117,24 +170,59 @@ class ConsentSession(Resource):
         default=None,
     )
 
-    url_ = "/oauth2/auth/sessions/consent"
+    path_ = "/oauth2/auth/sessions/consent"
+
+    def _post_bind(self) -> None:
+        self.url_ = urljoin(self.api_.url_, self.path_)
 
     @classmethod
     def _params(cls, subject: str, client: str = None) -> dict:
         return filter_none({"subject": subject, "client": client})
 
+    @staticmethod
+    def _next_page(
+        page_size: typing.Optional[int], offset: int, size: int, count: int
+    ) -> typing.Optional[typing.Tuple[int, int]]:
+        # Returns the offset and expected size of the next page, or None
+        # after the last one. Hydra caps the limit, so the size of the first
+        # page is taken as the actual page size and only a shorter page ends
+        # the listing. A first page larger than requested comes from a server
+        # that ignores the limit.
+        if not page_size or count == 0 or count > page_size:
+            return None
+        if offset == 0:
+            size = count
+        elif count < size:
+            return None
+        return offset + count, size
+
     @classmethod
-    def _list(cls, api: HydraAdmin, subject: str) -> typing.Iterator[ConsentSession]:
-        url = urljoin(api.url_, cls.url_)
-        response = api._request("GET", url, params=cls._params(subject))
-        session_list = response.json()
-        for consent_session in session_list:
-            yield ConsentSession._from_dict(consent_session, parent=api)
+    def _list(
+        cls, api: HydraAdmin, subject: str, page_size: typing.Optional[int] = 100
+    ) -> typing.Iterator[ConsentSession]:
+        url = urljoin(api.url_, cls.path_)
+        # Sessions are listed in pages, each decoded at once, which keeps the
+        # memory bounded by the page size. Without a page size all sessions
+        # are requested at once. Pages are only requested once the previous
+        # one has been consumed.
+        offset, size = 0, 0
+        while True:
+            params = cls._params(subject)
+            if page_size:
+                params.update(limit=page_size, offset=offset)
+            response = api._request("GET", url, params=params)
+            session_list = api._decode(response)
+            for consent_session in session_list:
+                yield ConsentSession._from_dict(consent_session, parent=api)
+            next_page = cls._next_page(page_size, offset, size, len(session_list))
+            if next_page is None:
+                return
+            offset, size = next_page
 
     @classmethod
     def _revoke(
         cls, api: HydraAdmin, subject: str, client: typing.Optional[str]
     ) -> None:
-        url = urljoin(api.url_, cls.url_)
+        url = urljoin(api.url_, cls.path_)
         # This returns 204/201 without any content
         api._request("DELETE", url, params=cls._params(subject, client))
@@ -4,7 +4,7 @@ import typing
 
 import attr
 
-from .common import OpenIDConnectContext
+from .common import error_data, OpenIDConnectContext
 from .model import Resource
 from .oauth2 import OAuth2Client
 from .utils import filter_none, urljoin
@@ -13,7 +13,7 @@ if typing.TYPE_CHECKING:
     from .api import HydraAdmin
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class LoginRequest(Resource):
     challenge: str
     client: OAuth2Client = attr.ib(
@@ -29,31 +29,27 @@ class LoginRequest(Resource):
     session_id: str
     skip: bool
     subject: str
-    url_ = "/oauth2/auth/requests/login"
+    path_ = "/oauth2/auth/requests/login"
 
     def _post_bind(self):
-        self.url_ = urljoin(self.parent_.url_, self.url_)
+        self.url_ = urljoin(self.api_.url_, self.path_)
 
     @classmethod
     def _params(cls, challenge: str) -> dict:
         return {"login_challenge": challenge}
 
     @classmethod
-    def _get(cls, api: HydraAdmin, challenge: str) -> LoginRequest:
-        url = urljoin(api.url_, cls.url_)
-        response = api._request("GET", url, cls._params(challenge))
-        return cls._from_dict(response.json(), parent=api)
-
-    def accept(
-        self,
+    def _accept_data(
+        cls,
         subject: str,
         acr: str = None,
         context: dict = None,
         force_subject_identifier: str = None,
         remember: bool = False,
         remember_for: int = None,
-    ) -> str:
-        data = filter_none(
+    ) -> dict:
+        # The body of accept requests, shared with the asyncio API
+        return filter_none(
             {
                 "acr": acr,
                 "context": context,
@@ -63,45 +59,106 @@ class LoginRequest(Resource):
                 "subject": subject,
             }
         )
-        url = urljoin(self.url_, "accept")
-        response = self._request(
-            "PUT", url, params=self._params(self.challenge), json=data
+
+    @classmethod
+    def _get(cls, api: HydraAdmin, challenge: str, raw: str = None) -> LoginRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = api._request("GET", url, cls._params(challenge))
+        return cls._from_response(api, response, raw)
+
+    @classmethod
+    def _accept(
+        cls,
+        resource: Resource,
+        url: str,
+        challenge: str,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        data = cls._accept_data(
+            subject, acr, context, force_subject_identifier, remember, remember_for
+        )
+        url = urljoin(url, "accept")
+        response = resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
         )
-        payload = response.json()
+        payload = resource._decode(response)
         return payload["redirect_to"]
 
-    def reject(
-        self,
+    @classmethod
+    def _reject(
+        cls,
+        resource: Resource,
+        url: str,
+        challenge: str,
         error: str = None,
         error_debug: str = None,
         error_description: str = None,
         error_hint: str = None,
         status_code: int = None,
     ) -> str:
-        url = urljoin(self.url_, "reject")
-        data = filter_none(
-            {
-                "error": error,
-                "error_debug": error_debug,
-                "error_description": error_description,
-                "error_hint": error_hint,
-                "status_code": status_code,
-            }
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
         )
-        response = self._request(
-            "PUT", url, params=self._params(self.challenge), json=data
+        response = resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
         )
-        payload = response.json()
+        payload = resource._decode(response)
         return payload["redirect_to"]
 
+    def accept(
+        self,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        return self._accept(
+            self,
+            self._bound_url(),
+            self.challenge,
+            subject,
+            acr,
+            context,
+            force_subject_identifier,
+            remember,
+            remember_for,
+        )
+
+    def reject(
+        self,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> str:
+        return self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
+        )
+
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class LoginSession(Resource):
 
-    url_ = "/oauth2/auth/sessions/login"
+    path_ = "/oauth2/auth/sessions/login"
 
     def _post_bind(self):
-        self.url_ = urljoin(self.parent_.url_, self.url_)
+        self.url_ = urljoin(self.api_.url_, self.path_)
 
     @classmethod
     def _params(cls, subject: str) -> dict:
@@ -109,6 +166,6 @@ class LoginSession(Resource):
 
     @classmethod
     def _invalidate_all(cls, api: HydraAdmin, subject: str) -> None:
-        url = urljoin(api.url_, cls.url_)
+        url = urljoin(api.url_, cls.path_)
         # This returns 204/201 without any content
         api._request("DELETE", url, params=cls._params(subject))
@@ -4,6 +4,7 @@ import typing
 
 import attr
 
+from .common import error_data
 from .model import Entity, Resource
 from .utils import filter_none, urljoin
 
@@ -11,7 +12,7 @@ if typing.TYPE_CHECKING:
     from .api import HydraAdmin
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class LogoutRequest(Resource):
     challenge: str
     request_url: str
@@ -19,35 +20,27 @@ class LogoutRequest(Resource):
     sid: str
     subject: str
 
-    url_ = "/oauth2/auth/requests/logout"
+    path_ = "/oauth2/auth/requests/logout"
 
     def _post_bind(self):
-        self.url_ = urljoin(self.parent_.url_, self.url_)
+        self.url_ = urljoin(self.api_.url_, self.path_)
 
     @classmethod
     def _params(cls, challenge: str) -> dict:
         return {"logout_challenge": challenge}
 
     @classmethod
-    def _get(cls, api: HydraAdmin, challenge: str) -> LogoutRequest:
-        url = urljoin(api.url_, cls.url_)
-        response = api._request("GET", url, cls._params(challenge))
-        # NOTE: we have to inject the challenge here since the endpoint doesn't
-        # return it as it's the case for login/consent.
-        data = response.json()
-        data["challenge"] = challenge
-        return cls._from_dict(data, parent=api)
-
-    def accept(
-        self,
+    def _accept_data(
+        cls,
         subject: str,
         acr: str = None,
         context: dict = None,
         force_subject_identifier: str = None,
         remember: bool = False,
         remember_for: int = None,
-    ) -> str:
-        data = filter_none(
+    ) -> dict:
+        # The body of accept requests, shared with the asyncio API
+        return filter_none(
             {
                 "acr": acr,
                 "context": context,
@@ -57,13 +50,65 @@ class LogoutRequest(Resource):
                 "subject": subject,
             }
         )
-        url = urljoin(self.url_, "accept")
-        response = self._request(
-            "PUT", url, params=self._params(self.challenge), json=data
+
+    @classmethod
+    def _get(cls, api: HydraAdmin, challenge: str, raw: str = None) -> LogoutRequest:
+        url = urljoin(api.url_, cls.path_)
+        response = api._request("GET", url, cls._params(challenge))
+        if raw is not None:
+            return api._decode_raw(response, raw)
+        # NOTE: we have to inject the challenge here since the endpoint doesn't
+        # return it as it's the case for login/consent.
+        data = api._decode(response)
+        data["challenge"] = challenge
+        return cls._from_dict(data, parent=api)
+
+    @classmethod
+    def _accept(
+        cls, resource: Resource, url: str, challenge: str, data: dict = None
+    ) -> str:
+        # Hydra doesn't expect a body; accept() still sends the one it always
+        # did for compatibility
+        url = urljoin(url, "accept")
+        response = resource._request(
+            "PUT", url, params=cls._params(challenge), json=data
         )
-        payload = response.json()
+        payload = resource._decode(response)
         return payload["redirect_to"]
 
+    @classmethod
+    def _reject(
+        cls,
+        resource: Resource,
+        url: str,
+        challenge: str,
+        error: str = None,
+        error_debug: str = None,
+        error_description: str = None,
+        error_hint: str = None,
+        status_code: int = None,
+    ) -> None:
+        url = urljoin(url, "reject")
+        data = error_data(
+            error, error_debug, error_description, error_hint, status_code
+        )
+        # This returns 204/201 without any content
+        resource._request("PUT", url, params=cls._params(challenge), json=data)
+
+    def accept(
+        self,
+        subject: str,
+        acr: str = None,
+        context: dict = None,
+        force_subject_identifier: str = None,
+        remember: bool = False,
+        remember_for: int = None,
+    ) -> str:
+        data = self._accept_data(
+            subject, acr, context, force_subject_identifier, remember, remember_for
+        )
+        return self._accept(self, self._bound_url(), self.challenge, data)
+
     def reject(
         self,
         error: str = None,
@@ -72,15 +117,13 @@ class LogoutRequest(Resource):
         error_hint: str = None,
         status_code: int = None,
     ) -> None:
-        url = urljoin(self.url_, "reject")
-        data = filter_none(
-            {
-                "error": error,
-                "error_debug": error_debug,
-                "error_description": error_description,
-                "error_hint": error_hint,
-                "status_code": status_code,
-            }
+        self._reject(
+            self,
+            self._bound_url(),
+            self.challenge,
+            error,
+            error_debug,
+            error_description,
+            error_hint,
+            status_code,
         )
-        # This returns 204/201 without any content
-        self._request("PUT", url, params=self._params(self.challenge), json=data)
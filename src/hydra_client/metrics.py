@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import typing
+from urllib.parse import urlsplit
+
+import attr
+
+from . import exceptions
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = typing.Tuple[typing.Tuple[str, str], ...]
+
+# Name suffix, type, help and RequestMetrics attribute of the plain samples
+SAMPLES = (
+    ("request_bytes_total", "counter", "Request body bytes sent", "request_bytes"),
+    ("response_bytes_total", "counter", "Response body bytes", "response_bytes"),
+    ("responses_total", "counter", "Responses by status code", "responses"),
+    ("errors_total", "counter", "Failed requests by exception", "errors"),
+    ("requests_in_flight", "gauge", "Requests in progress", "in_flight"),
+)
+
+
+def endpoint_template(api_url: str, url: str) -> str:
+    # Challenges and subjects are query parameters, client ids the only
+    # variable path segment.
+    base = urlsplit(api_url).path.rstrip("/")
+    path = urlsplit(url).path
+    if base and path.startswith(base):
+        path = path[len(base) :]
+    if path.startswith("/clients/"):
+        return "/clients/{id}"
+    return path
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class RequestEvent:
+    method: str
+    endpoint: str
+    duration: float
+    request_bytes: int
+    response_bytes: int
+    status: typing.Optional[int]
+    exception: typing.Optional[typing.Type[exceptions.HydraException]]
+
+
+class RequestHook:
+    # Called around every request of an API created with this hook; hooks
+    # run on the calling thread and should return quickly.
+
+    def request_started(self, method: str, endpoint: str) -> None:
+        pass
+
+    def request_finished(self, event: RequestEvent) -> None:
+        pass
+
+
+class RequestTracker:
+    # Measures a single request for the hooks of an API. The latency is the
+    # time until the response headers were received, streamed bodies are
+    # still read afterwards.
+
+    def __init__(
+        self,
+        hooks: typing.Sequence[RequestHook],
+        method: str,
+        endpoint: str,
+        body: typing.Optional[bytes],
+    ):
+        self.hooks = hooks
+        self.method = method
+        self.endpoint = endpoint
+        self.request_bytes = len(body) if body else 0
+        self.response: typing.Any = None
+        self.stream = False
+
+    def __enter__(self) -> RequestTracker:
+        for hook in self.hooks:
+            hook.request_started(self.method, self.endpoint)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self.start
+        # HTTP errors are raised with the library's exception as cause
+        response = self.response or getattr(
+            getattr(exc, "__cause__", None), "response", None
+        )
+        if exc_type is not None and not issubclass(exc_type, exceptions.HydraException):
+            exc_type = None
+        event = RequestEvent(
+            method=self.method,
+            endpoint=self.endpoint,
+            duration=duration,
+            request_bytes=self.request_bytes,
+            response_bytes=self._response_bytes(response),
+            status=None if response is None else response.status_code,
+            exception=exc_type,
+        )
+        for hook in self.hooks:
+            hook.request_finished(event)
+
+    def _response_bytes(self, response: typing.Any) -> int:
+        if response is None:
+            return 0
+        length = response.headers.get("Content-Length")
+        if length is not None:
+            return int(length)
+        if self.stream:
+            # Unknown without reading the body here
+            return 0
+        return len(response.content)
+
+
+class Histogram:
+    def __init__(self, buckets: typing.Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics(RequestHook):
+    # Collects request metrics in process, export() renders them in the
+    # Prometheus text format.
+
+    def __init__(
+        self, prefix: str = "hydra_client", buckets: typing.Sequence[float] = None
+    ):
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self.durations: typing.Dict[Labels, Histogram] = {}
+        self.request_bytes: typing.Dict[Labels, int] = collections.Counter()
+        self.response_bytes: typing.Dict[Labels, int] = collections.Counter()
+        self.responses: typing.Dict[Labels, int] = collections.Counter()
+        self.errors: typing.Dict[Labels, int] = collections.Counter()
+        self.in_flight: typing.Dict[Labels, int] = collections.Counter()
+        self._lock = threading.Lock()
+
+    def request_started(self, method: str, endpoint: str) -> None:
+        with self._lock:
+            self.in_flight[(("method", method), ("endpoint", endpoint))] += 1
+
+    def request_finished(self, event: RequestEvent) -> None:
+        labels = (("method", event.method), ("endpoint", event.endpoint))
+        with self._lock:
+            self.in_flight[labels] -= 1
+            histogram = self.durations.get(labels)
+            if histogram is None:
+                histogram = self.durations[labels] = Histogram(self.buckets)
+            histogram.observe(event.duration)
+            self.request_bytes[labels] += event.request_bytes
+            self.response_bytes[labels] += event.response_bytes
+            if event.status is not None:
+                self.responses[labels + (("status", str(event.status)),)] += 1
+            if event.exception is not None:
+                exception = event.exception.__name__
+                self.errors[labels + (("exception", exception),)] += 1
+
+    def export(self) -> str:
+        lines: typing.List[str] = []
+        with self._lock:
+            name = self.prefix + "_request_duration_seconds"
+            self._header(lines, name, "histogram", "Latency of requests")
+            for labels, histogram in sorted(self.durations.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = labels + (("le", repr(float(bound))),)
+                    lines.append(self._sample(name + "_bucket", le, cumulative))
+                le = labels + (("le", "+Inf"),)
+                lines.append(self._sample(name + "_bucket", le, histogram.count))
+                lines.append(self._sample(name + "_sum", labels, histogram.sum))
+                lines.append(self._sample(name + "_count", labels, histogram.count))
+            for suffix, kind, help, attribute in SAMPLES:
+                samples = getattr(self, attribute)
+                name = "{}_{}".format(self.prefix, suffix)
+                self._header(lines, name, kind, help)
+                for labels, value in sorted(samples.items()):
+                    lines.append(self._sample(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(lines: typing.List[str], name: str, kind: str, help: str) -> None:
+        lines.append("# HELP {} {}".format(name, help))
+        lines.append("# TYPE {} {}".format(name, kind))
+
+    @staticmethod
+    def _sample(name: str, labels: Labels, value: float) -> str:
+        pairs = ",".join(
+            '{}="{}"'.format(
+                key,
+                label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for key, label in labels
+        )
+        return "{}{{{}}} {}".format(name, pairs, value)
@@ -1,35 +1,331 @@
 from __future__ import annotations
 
 import collections
+import contextlib
+import contextvars
+import functools
 import typing
 
 import attr
 import requests
 
 from . import exceptions
+from .codec import default_codec, iter_array, JSONCodec
+from .metrics import endpoint_template, RequestHook, RequestTracker
+from .profiler import active_profile, CallProfile
+
+if typing.TYPE_CHECKING:
+    import httpx
+
+    # What decoding needs is shared by the responses of both APIs
+    AnyResponse = typing.Union[requests.Response, httpx.Response]
 
 T = typing.TypeVar("T", bound="Entity")
 U = typing.TypeVar("U", bound="Resource")
 
+STREAM_CHUNK_SIZE = 64 * 1024
+JSON_HEADERS = {"Content-Type": "application/json"}
+RAW_MODES = ("json", "bytes")
+SERIALIZATION_FORMAT = b"\x02"
+
+# While set, _from_dict only stores the payload and fields are decoded on
+# first access. Converters run while hydrating a field see it as well, so
+# nested entities are decoded lazily too.
+lazy_decoding: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "lazy_decoding", default=False
+)
+
+
+# The API a payload is decoded for, so converters of nested entities can use
+# its per-API options.
+decoding_api: contextvars.ContextVar[typing.Optional[Resource]] = (
+    contextvars.ContextVar("decoding_api", default=None)
+)
+
+
+@contextlib.contextmanager
+def lazy(enabled: bool = True) -> typing.Iterator[None]:
+    token = lazy_decoding.set(enabled)
+    try:
+        yield
+    finally:
+        lazy_decoding.reset(token)
+
+
+@contextlib.contextmanager
+def decoding_for(api: typing.Optional[Resource]) -> typing.Iterator[None]:
+    token = decoding_api.set(api)
+    try:
+        yield
+    finally:
+        decoding_api.reset(token)
+
+
+# Field values that can't hold a resource, skipped when binding
+UNBOUND_TYPES = frozenset((str, int, float, bool, type(None), list, dict))
+
+
+def bind(value: typing.Any, parent: Resource) -> None:
+    # Values that are already bound keep their parent; these are instances
+    # shared between resources, e.g. interned clients.
+    if type(value) in UNBOUND_TYPES or getattr(value, "parent_", None) is not None:
+        return
+    try:
+        value._bind(parent)
+    except AttributeError:
+        pass
+
+
+def decode_lines(
+    cls: typing.Type[Entity],
+    fields: typing.Iterable[attr.Attribute],
+    namespace: typing.Dict[str, typing.Any],
+    target: str,
+    profiled: bool = False,
+) -> typing.List[str]:
+    # Source lines that decode each field from `data` and assign it to
+    # `target`, formatted with the field's index and name. Profiled decoders
+    # attribute the time spent in converters to a `profile`.
+    lines = []
+    for i, field in enumerate(fields):
+        value = "data[{!r}]".format(field.name)
+        if isinstance(field.default, attr.Factory):  # type: ignore
+            namespace["factory_{}".format(i)] = field.default.factory
+            default = "factory_{}()".format(i)
+        elif field.default is not attr.NOTHING:
+            namespace["default_{}".format(i)] = field.default
+            default = "default_{}".format(i)
+        else:
+            default = None
+        if field.converter is not None:
+            namespace["converter_{}".format(i)] = field.converter
+            value = "converter_{0}({1})".format(i, value)
+            if default is not None:
+                default = "converter_{0}({1})".format(i, default)
+        name = target.format(i=i, name=field.name)
+        timed = profiled and field.converter is not None
+        lines.append("    if {!r} in data:".format(field.name))
+        lines += assign_lines(name, value, timed)
+        lines.append("    else:")
+        if default is None:
+            message = "{}() missing required field {!r}".format(
+                cls.__name__, field.name
+            )
+            lines.append("        raise TypeError({!r})".format(message))
+        else:
+            lines += assign_lines(name, default, timed)
+    return lines
+
+
+def assign_lines(name: str, value: str, timed: bool) -> typing.List[str]:
+    if not timed:
+        return ["        {} = {}".format(name, value)]
+    return [
+        "        profile.push('convert')",
+        "        {} = {}".format(name, value),
+        "        profile.pop()",
+    ]
+
+
+def compile_decoder(
+    cls: typing.Type[T], profiled: bool = False
+) -> typing.Callable[..., T]:
+    # Generates a constructor that reads every field straight from the
+    # payload and runs its converter, instead of filtering the payload into
+    # keyword arguments for __init__. Unknown keys are ignored, converters
+    # run on defaults just like they do in the attrs generated __init__.
+    namespace: typing.Dict[str, typing.Any] = {"new": object.__new__, "cls": cls}
+    signature = "def decode(data, profile):" if profiled else "def decode(data):"
+    lines = [signature, "    self = new(cls)"]
+    lines += decode_lines(cls, attr.fields(cls), namespace, "self.{name}", profiled)
+    lines.append("    return self")
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
+
+
+def compile_record_decoder(
+    cls: typing.Type[Entity], names: typing.Tuple[str, ...]
+) -> typing.Callable[[dict], tuple]:
+    # Like compile_decoder, but only the given fields are decoded, into a
+    # namedtuple instead of a model instance.
+    attributes = attr.fields_dict(cls)
+    try:
+        fields = [attributes[name] for name in names]
+    except KeyError as exc:
+        raise TypeError("{} has no field {}".format(cls.__name__, exc)) from None
+    record = collections.namedtuple(cls.__name__ + "Record", names)  # type: ignore
+    namespace: typing.Dict[str, typing.Any] = {"record": record}
+    lines = ["def decode(data):"]
+    lines += decode_lines(cls, fields, namespace, "value_{i}")
+    values = ", ".join("value_{}".format(i) for i in range(len(fields)))
+    lines.append("    return record({})".format(values))
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
+
+
+def decode_field(field: attr.Attribute, data: dict) -> typing.Any:
+    # Runtime counterpart of a single field in a compiled decoder
+    if field.name in data:
+        value = data[field.name]
+    elif isinstance(field.default, attr.Factory):  # type: ignore
+        value = field.default.factory()
+    elif field.default is not attr.NOTHING:
+        value = field.default
+    else:
+        raise TypeError("missing required field {!r}".format(field.name))
+    if field.converter is not None:
+        value = field.converter(value)
+    return value
+
 
 class Entity:
+    # Holds the payload of a lazily decoded entity
+    __slots__ = ("raw_",)
+
     @classmethod
     def _from_dict(cls: typing.Type[T], data: dict) -> T:
-        fields = attr.fields_dict(cls)
-        clean_data = {k: v for k, v in data.items() if k in fields}
-        return cls(**clean_data)  # type: ignore
+        if lazy_decoding.get():
+            instance = object.__new__(cls)
+            instance.raw_ = data
+            return instance
+        profile = active_profile.get()
+        if profile is not None:
+            return cls._profiled_from_dict(data, profile)
+        # Decoders are compiled on first use and cached per class; subclasses
+        # get their own, as they may redefine fields.
+        decoder = cls.__dict__.get("_decoder_")
+        if decoder is None:
+            decoder = compile_decoder(cls)
+            setattr(cls, "_decoder_", decoder)
+        return decoder(data)
+
+    @classmethod
+    def _profiled_from_dict(cls: typing.Type[T], data: dict, profile: CallProfile) -> T:
+        decoder = cls.__dict__.get("_profiled_decoder_")
+        if decoder is None:
+            decoder = compile_decoder(cls, profiled=True)
+            setattr(cls, "_profiled_decoder_", decoder)
+        profile.push("construct")
+        try:
+            return decoder(data, profile)
+        finally:
+            profile.pop()
+
+    @classmethod
+    def _record_decoder(
+        cls, fields: typing.Iterable[str]
+    ) -> typing.Callable[[dict], tuple]:
+        # Projections of a class are compiled on first use and cached per
+        # field list.
+        names = tuple(fields)
+        decoders = cls.__dict__.get("_record_decoders_")
+        if decoders is None:
+            decoders = {}
+            setattr(cls, "_record_decoders_", decoders)
+        decoder = decoders.get(names)
+        if decoder is None:
+            decoder = decoders[names] = compile_record_decoder(cls, names)
+        return decoder
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # Only reached for unset slots, i.e. fields of a lazily decoded entity
+        # that haven't been accessed yet.
+        try:
+            raw = object.__getattribute__(self, "raw_")
+            field = attr.fields_dict(self.__class__)[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(name) from None
+        try:
+            parent = object.__getattribute__(self, "parent_")
+        except AttributeError:
+            # Not bound (yet), _bind takes care of hydrated fields
+            parent = None
+        with lazy(), decoding_for(getattr(self, "api_", None)):
+            value = decode_field(field, raw)
+        setattr(self, name, value)
+        if parent is not None:
+            bind(value, self)
+        return value
+
+    def _to_dict(self) -> dict:
+        # Inverse of _from_dict; fields with a converter from a non-JSON type
+        # declare a "serializer" in their metadata.
+        data = {}
+        for field in attr.fields(self.__class__):
+            value = getattr(self, field.name)
+            serializer = field.metadata.get("serializer")
+            if serializer is not None and value is not None:
+                data[field.name] = serializer(value)
+            else:
+                data[field.name] = to_primitive(value)
+        return data
 
 
 class Resource(Entity):
+    # Binding state, kept in slots so slotted models don't need a __dict__
+    __slots__ = ("api_", "parent_", "session_", "url_")
+
+    path_: str
     url_: str
+    lazy_ = False
+    raw_mode_: typing.Optional[str] = None
+    codec_: JSONCodec = default_codec()
+    hooks_: typing.Sequence[RequestHook] = ()
 
     def _request(
-        self, method: str, url: str, params: dict = None, json: dict = None
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        json: dict = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        try:
+            api = self.api_
+            body = None if json is None else api.codec_.dumps(json)
+        except AttributeError:
+            raise exceptions.UnboundResourceError
+        profile = active_profile.get()
+        if profile is not None:
+            profile.push("network")
+        try:
+            if not api.hooks_:
+                return self._send(method, url, params, body, stream)
+            endpoint = endpoint_template(api.url_, url)
+            with RequestTracker(api.hooks_, method, endpoint, body) as tracker:
+                tracker.stream = stream
+                tracker.response = self._send(method, url, params, body, stream)
+            return tracker.response
+        finally:
+            if profile is not None:
+                profile.pop()
+
+    def _bound_url(self) -> str:
+        # Models that were created directly have no URL to send requests to
+        try:
+            return self.url_
+        except AttributeError:
+            raise exceptions.UnboundResourceError from None
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: typing.Optional[dict],
+        body: typing.Optional[bytes],
+        stream: bool,
     ) -> requests.Response:
         try:
             response = typing.cast(
                 requests.Response,
-                self.session_.request(method, url, params=params, json=json),
+                self.session_.request(
+                    method,
+                    url,
+                    params=params,
+                    data=body,
+                    headers=None if body is None else JSON_HEADERS,
+                    stream=stream,
+                ),
             )
         except (
             requests.exceptions.ConnectionError,
@@ -50,35 +346,133 @@ class Resource(Entity):
             raise wrapper_exc from exc
         return response
 
+    def _decode(self, response: AnyResponse) -> typing.Any:
+        profile = active_profile.get()
+        if profile is None:
+            return self.api_.codec_.loads(response.content)
+        content = response.content
+        return profile.timed("decode", self.api_.codec_.loads)(content)
+
+    def _raw_mode(self, raw: str = None) -> str:
+        # A per call value overrides the API wide setting
+        mode = raw or self.api_.raw_mode_ or "json"
+        if mode not in RAW_MODES:
+            raise ValueError("raw must be one of {}, not {!r}".format(RAW_MODES, mode))
+        return mode
+
+    def _decode_raw(self, response: AnyResponse, mode: str) -> typing.Any:
+        # The error mapping already happened in _request
+        if mode == "bytes":
+            return response.content
+        return self._decode(response)
+
+    def _iter_decode(self, response: requests.Response) -> typing.Iterator[typing.Any]:
+        # Decodes the elements of an array response as its body arrives; the
+        # request has to be made with stream=True.
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        loads = self.api_.codec_.loads
+        profile = active_profile.get()
+        try:
+            if profile is None:
+                yield from iter_array(chunks, loads)
+            else:
+                # Splitting the array counts as decoding, reading chunks as
+                # network time.
+                chunks = profile.timed_iter("network", chunks)
+                loads = profile.timed("decode", loads)
+                yield from profile.timed_iter("decode", iter_array(chunks, loads))
+        finally:
+            response.close()
+
+    def dumps(self) -> bytes:
+        # Compact state of the model without its binding, e.g. for keeping a
+        # request in a session store; restore it with the API's restore().
+        # It is encoded with the API's codec, or the default one for models
+        # that aren't bound.
+        codec = getattr(self, "api_", self).codec_
+        state = [self.path_, self._to_dict()]
+        return SERIALIZATION_FORMAT + codec.dumps(state)
+
+    def _restore(self, data: bytes, models: typing.Iterable[typing.Type[U]]) -> U:
+        if data[:1] != SERIALIZATION_FORMAT:
+            raise ValueError("Unsupported serialization format")
+        try:
+            path, payload = self.api_.codec_.loads(data[1:])
+        except (TypeError, ValueError) as exc:
+            # Truncated data or data that wasn't written by dumps()
+            raise ValueError("Invalid serialized model") from exc
+        # Models are identified by their endpoint path, which is shared by
+        # the sync and async variant of a model.
+        for model in models:
+            if model.path_ == path:
+                try:
+                    return model._from_dict(payload, parent=self)
+                except (AttributeError, TypeError) as exc:
+                    raise ValueError("Invalid serialized model") from exc
+        raise ValueError("No model for {}".format(path))
+
     def _post_bind(self) -> None:
         pass
 
     def _bind(self, parent: Resource) -> None:
-        self.parent_ = parent
-        self.session_ = getattr(self.parent_, "session_", None)
-        self._post_bind()
-        for field in attr.fields(self.__class__):
-            value = getattr(self, field.name)
-            try:
-                value._bind(self)
-            except AttributeError:
-                pass
+        profile = active_profile.get()
+        if profile is not None:
+            profile.push("bind")
+        try:
+            self.parent_ = parent
+            self.api_ = self.parent_.api_
+            self.session_ = getattr(self.parent_, "session_", None)
+            self._post_bind()
+            for field in attr.fields(self.__class__):
+                try:
+                    value = object.__getattribute__(self, field.name)
+                except AttributeError:
+                    # Lazy fields are bound when they are first accessed
+                    continue
+                bind(value, self)
+        finally:
+            if profile is not None:
+                profile.pop()
+
+    @classmethod
+    def _decoder(
+        cls: typing.Type[U], parent: Resource, fields: typing.Iterable[str] = None
+    ) -> typing.Callable[[dict], typing.Union[U, tuple]]:
+        # Decodes bound instances, or records of only the given fields
+        if fields is None:
+            return functools.partial(cls._from_dict, parent=parent)
+        return cls._record_decoder(fields)
+
+    @classmethod
+    def _from_response(
+        cls: typing.Type[U],
+        api: Resource,
+        response: AnyResponse,
+        raw: str = None,
+        fields: typing.Iterable[str] = None,
+    ) -> typing.Any:
+        if raw is not None:
+            return api._decode_raw(response, raw)
+        return cls._decoder(api, fields)(api._decode(response))
 
     @classmethod
     def _from_dict(cls: typing.Type[U], data: dict, parent: Resource = None) -> U:
-        instance = super()._from_dict(data)
-        if parent is not None:
-            instance._bind(parent)
+        if parent is None:
+            return super()._from_dict(data)
+        with decoding_for(parent.api_):
+            if parent.api_.lazy_:
+                with lazy():
+                    instance = super()._from_dict(data)
+            else:
+                instance = super()._from_dict(data)
+        instance._bind(parent)
         return instance
 
 
 class ResourceList(collections.UserList):
     def _bind(self, parent: Resource) -> None:
         for item in self:
-            try:
-                item._bind(parent)
-            except AttributeError:
-                pass
+            bind(item, parent)
 
 
 def list_attr(klass: typing.Type[Entity], factory=None) -> typing.Any:
@@ -90,8 +484,16 @@ def list_attr(klass: typing.Type[Entity], factory=None) -> typing.Any:
     return attr.ib(converter=converter, factory=factory)
 
 
+def to_primitive(value: typing.Any) -> typing.Any:
+    if isinstance(value, Entity):
+        return value._to_dict()
+    if isinstance(value, (list, collections.UserList)):
+        return [to_primitive(v) for v in value]
+    return value
+
+
 def optional_from_dict(
-    klass: typing.Type[T]
+    klass: typing.Type[T],
 ) -> typing.Callable[[dict], typing.Optional[T]]:
     def converter(data: dict) -> typing.Optional[T]:
         if data is None:
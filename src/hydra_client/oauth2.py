@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 from datetime import datetime
+import itertools
 import typing
+import weakref
 
 import attr
-import dateutil.parser
 
-from .model import Entity, list_attr, optional_from_dict, Resource
-from .utils import filter_none, urljoin
+from .model import decoding_api, Entity, list_attr, optional_from_dict, Resource
+from .utils import filter_none, parse_datetime, urljoin
 
 if typing.TYPE_CHECKING:
     from .api import HydraAdmin
+    from .cache import ClientCache, SharedClientCache
 
+C = typing.TypeVar("C", bound="OAuth2Client")
 
-@attr.s(auto_attribs=True, kw_only=True)
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class JSONWebKey(Entity):
     alg: str
     crv: str
@@ -34,12 +40,12 @@ class JSONWebKey(Entity):
     y: str
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class JSONWebKeySet(Entity):
     keys: typing.List[JSONWebKey] = list_attr(JSONWebKey, factory=list)
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class OAuth2Client(Resource):
     allowed_cors_origins: typing.List[str]
     audience: typing.List[str]
@@ -49,7 +55,8 @@ class OAuth2Client(Resource):
     client_name: str
     client_secret: typing.Optional[str] = None
     client_secret_expires_at: datetime = attr.ib(
-        converter=datetime.fromtimestamp  # type: ignore
+        converter=datetime.fromtimestamp,  # type: ignore
+        metadata={"serializer": lambda d: int(d.timestamp())},
     )
     client_uri: str
     contacts: typing.List[str]
@@ -74,28 +81,135 @@ class OAuth2Client(Resource):
     subject_type: str
     token_endpoint_auth_method: str
     tos_uri: str
-    updated_at: datetime = attr.ib(converter=dateutil.parser.parse)
+    updated_at: datetime = attr.ib(
+        converter=parse_datetime, metadata={"serializer": datetime.isoformat}
+    )
     userinfo_signed_response_alg: str
 
-    url_ = "/clients"
+    path_ = "/clients"
 
     def _post_bind(self):
-        self.url_ = urljoin(self.parent_.url_, self.url_, self.client_id)
+        self.url_ = urljoin(self.api_.url_, self.path_, self.client_id)
+
+    @classmethod
+    def _from_dict(  # type: ignore
+        cls: typing.Type[C], data: dict, parent: Resource = None
+    ) -> C:
+        # Clients embedded in requests and sessions are decoded without a
+        # parent; they are interned if the API they're decoded for has an
+        # interner.
+        interner = getattr(decoding_api.get(), "interner_", None)
+        if parent is not None or interner is None:
+            return super()._from_dict(data, parent)
+        key = (cls, data.get("client_id"), data.get("updated_at"))
+        client = interner.get(key)
+        if client is None:
+            client = super()._from_dict(data, parent=interner.api)
+            interner.set(key, client)
+        return client
 
     @classmethod
     def _list(
-        cls, api: HydraAdmin, limit: int = None, offset: int = None
-    ) -> typing.List[OAuth2Client]:
-        url = urljoin(api.url_, cls.url_)
+        cls,
+        api: HydraAdmin,
+        limit: int = None,
+        offset: int = None,
+        fields: typing.Sequence[str] = None,
+        raw: str = None,
+    ) -> typing.Any:
+        url = urljoin(api.url_, cls.path_)
         params = filter_none({"limit": limit, "offset": offset})
         response = api._request("GET", url, params=params)
-        payload = response.json()
-        return [OAuth2Client._from_dict(d, parent=api) for d in payload]
+        if raw is not None:
+            return api._decode_raw(response, raw)
+        decode = cls._decoder(api, fields)
+        return [decode(d) for d in api._decode(response)]
 
     @classmethod
-    def create(
+    def _pages(
+        cls,
+        api: HydraAdmin,
+        page_size: int,
+        concurrency: int,
+        stream: bool,
+        decode: typing.Callable[[typing.Iterable[typing.Any]], list],
+    ) -> typing.Iterator[list]:
+        url = urljoin(api.url_, cls.path_)
+
+        def fetch(offset: int) -> list:
+            params = {"limit": page_size, "offset": offset}
+            response = api._request("GET", url, params=params, stream=stream)
+            # Streamed pages are decoded one client at a time as the body
+            # arrives, which takes less memory but is slower than decoding
+            # the whole body at once.
+            if stream:
+                return decode(api._iter_decode(response))
+            return decode(api._decode(response))
+
+        # Hydra caps the limit (at 500), so the size of the first page is
+        # taken as the actual page size: a shorter page marks the end of the
+        # collection. A first page larger than requested comes from a server
+        # that ignores the limit and holds all clients.
+        first = fetch(0)
+        size = len(first)
+        if size == 0 or size > page_size:
+            if first:
+                yield first
+            return
+
+        # Up to `concurrency` further pages are fetched and decoded by the
+        # pool while the current page is consumed. Pages are always yielded
+        # in offset order.
+        offsets = itertools.count(size, size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            pending = collections.deque(
+                pool.submit(fetch, next(offsets)) for _ in range(concurrency)
+            )
+            try:
+                yield first
+                while pending:
+                    page = pending.popleft().result()
+                    if len(page) < size:
+                        if page:
+                            yield page
+                        break
+                    pending.append(pool.submit(fetch, next(offsets)))
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @classmethod
+    def _iter(
         cls,
         api: HydraAdmin,
+        page_size: int,
+        concurrency: int = 1,
+        fields: typing.Sequence[str] = None,
+        stream: bool = False,
+    ) -> typing.Iterator[typing.Union[OAuth2Client, tuple]]:
+        decode_item = cls._decoder(api, fields)
+
+        def decode(items: typing.Iterable[typing.Any]) -> list:
+            return [decode_item(d) for d in items]
+
+        for page in cls._pages(api, page_size, concurrency, stream, decode):
+            yield from page
+
+    @classmethod
+    def _export_ndjson(
+        cls, api: HydraAdmin, page_size: int, concurrency: int, stream: bool = False
+    ) -> typing.Iterator[str]:
+        def decode(items: typing.Iterable[typing.Any]) -> typing.List[str]:
+            dumps = api.codec_.dumps
+            return [dumps(d).decode() + "\n" for d in items]
+
+        for page in cls._pages(api, page_size, concurrency, stream, decode):
+            yield from page
+
+    @classmethod
+    def _client_data(
+        cls,
         allowed_cors_origins: typing.List[str] = None,
         audience: typing.List[str] = None,
         backchannel_logout_session_required: bool = None,
@@ -125,9 +239,9 @@ class OAuth2Client(Resource):
         token_endpoint_auth_method: str = None,
         tos_uri: str = None,
         userinfo_signed_response_alg: str = None,
-    ) -> OAuth2Client:
-        url = urljoin(api.url_, cls.url_)
-        data = filter_none(
+    ) -> dict:
+        # The body of create and update requests, shared with the asyncio API
+        return filter_none(
             {
                 "allowed_cors_origins": allowed_cors_origins,
                 "audience": audience,
@@ -160,14 +274,94 @@ class OAuth2Client(Resource):
                 "userinfo_signed_response_alg": userinfo_signed_response_alg,
             }
         )
+
+    @classmethod
+    def create(
+        cls,
+        api: HydraAdmin,
+        allowed_cors_origins: typing.List[str] = None,
+        audience: typing.List[str] = None,
+        backchannel_logout_session_required: bool = None,
+        backchannel_logout_uri: str = None,
+        client_id: str = None,
+        client_name: str = None,
+        client_secret: str = None,
+        client_secret_expires_at: int = None,
+        client_uri: str = None,
+        contacts: typing.List[str] = None,
+        frontchannel_logout_session_required: bool = None,
+        frontchannel_logout_uri: str = None,
+        grant_types: typing.List[str] = None,
+        jwks: dict = None,
+        jwks_uri: str = None,
+        logo_uri: str = None,
+        owner: str = None,
+        policy_uri: str = None,
+        post_logout_redirect_uris: typing.List[str] = None,
+        redirect_uris: typing.List[str] = None,
+        redirect_object_signing_alg: str = None,
+        request_uris: typing.List[str] = None,
+        response_uris: typing.List[str] = None,
+        scope: str = None,
+        sector_identifier_uri: str = None,
+        subject_type: str = None,
+        token_endpoint_auth_method: str = None,
+        tos_uri: str = None,
+        userinfo_signed_response_alg: str = None,
+    ) -> OAuth2Client:
+        url = urljoin(api.url_, cls.path_)
+        data = cls._client_data(
+            allowed_cors_origins,
+            audience,
+            backchannel_logout_session_required,
+            backchannel_logout_uri,
+            client_id,
+            client_name,
+            client_secret,
+            client_secret_expires_at,
+            client_uri,
+            contacts,
+            frontchannel_logout_session_required,
+            frontchannel_logout_uri,
+            grant_types,
+            jwks,
+            jwks_uri,
+            logo_uri,
+            owner,
+            policy_uri,
+            post_logout_redirect_uris,
+            redirect_uris,
+            redirect_object_signing_alg,
+            request_uris,
+            response_uris,
+            scope,
+            sector_identifier_uri,
+            subject_type,
+            token_endpoint_auth_method,
+            tos_uri,
+            userinfo_signed_response_alg,
+        )
         response = api._request("POST", url, json=data)
-        return cls._from_dict(response.json(), parent=api)
+        return cls._from_dict(api._decode(response), parent=api)
 
     @classmethod
-    def _get(cls, api: HydraAdmin, client_id: str) -> OAuth2Client:
-        url = urljoin(api.url_, cls.url_, client_id)
+    def _get(
+        cls,
+        api: HydraAdmin,
+        client_id: str,
+        fields: typing.Sequence[str] = None,
+        raw: str = None,
+    ) -> typing.Any:
+        url = urljoin(api.url_, cls.path_, client_id)
         response = api._request("GET", url)
-        return cls._from_dict(response.json(), parent=api)
+        return cls._from_response(api, response, raw, fields)
+
+    @classmethod
+    def _delete(cls, api: HydraAdmin, client_id: str) -> None:
+        url = urljoin(api.url_, cls.path_, client_id)
+        api._request("DELETE", url)
+        if api.cache_ is not None:
+            api.cache_.invalidate(client_id)
 
     def update(
         self,
@@ -201,45 +395,98 @@ class OAuth2Client(Resource):
         tos_uri: str = None,
         userinfo_signed_response_alg: str = None,
     ) -> OAuth2Client:
-        data = filter_none(
-            {
-                "allowed_cors_origins": allowed_cors_origins,
-                "audience": audience,
-                "backchannel_logout_session_required": backchannel_logout_session_required,
-                "backchannel_logout_uri": backchannel_logout_uri,
-                "client_id": client_id,
-                "client_name": client_name,
-                "client_secret": client_secret,
-                "client_secret_expires_at": client_secret_expires_at,
-                "client_uri": client_uri,
-                "contacts": contacts,
-                "frontchannel_logout_session_required": frontchannel_logout_session_required,
-                "frontchannel_logout_uri": frontchannel_logout_uri,
-                "grant_types": grant_types,
-                "jwks": jwks,
-                "jwks_uri": jwks_uri,
-                "logo_uri": logo_uri,
-                "owner": owner,
-                "policy_uri": policy_uri,
-                "post_logout_redirect_uris": post_logout_redirect_uris,
-                "redirect_uris": redirect_uris,
-                "redirect_object_signing_alg": redirect_object_signing_alg,
-                "request_uris": request_uris,
-                "response_uris": response_uris,
-                "scope": scope,
-                "sector_identifier_uri": sector_identifier_uri,
-                "subject_type": subject_type,
-                "token_endpoint_auth_method": token_endpoint_auth_method,
-                "tos_uri": tos_uri,
-                "userinfo_signed_response_alg": userinfo_signed_response_alg,
-            }
+        data = self._client_data(
+            allowed_cors_origins,
+            audience,
+            backchannel_logout_session_required,
+            backchannel_logout_uri,
+            client_id,
+            client_name,
+            client_secret,
+            client_secret_expires_at,
+            client_uri,
+            contacts,
+            frontchannel_logout_session_required,
+            frontchannel_logout_uri,
+            grant_types,
+            jwks,
+            jwks_uri,
+            logo_uri,
+            owner,
+            policy_uri,
+            post_logout_redirect_uris,
+            redirect_uris,
+            redirect_object_signing_alg,
+            request_uris,
+            response_uris,
+            scope,
+            sector_identifier_uri,
+            subject_type,
+            token_endpoint_auth_method,
+            tos_uri,
+            userinfo_signed_response_alg,
         )
-        response = self._request("PUT", self.url_, json=data)
-        payload = response.json()
-        # Create another instance, so all converters are run
+        response = self._request("PUT", self._bound_url(), json=data)
+        client = self._updated(self._decode(response))
+        cache = self._cache()
+        if cache is not None:
+            cache.set(client)
+        return client
+
+    def _updated(self, payload: dict) -> OAuth2Client:
+        # Create another instance, so all converters are run. Interned
+        # clients are shared by other requests, so they're left unchanged
+        # and the new instance is returned instead.
         other = self._from_dict(payload, parent=self.parent_)
-        self.__dict__.update(other.__dict__)
+        interner = getattr(self.api_, "interner_", None)
+        if interner is not None and interner.evict(self):
+            return other
+        for field in attr.fields(self.__class__):
+            setattr(self, field.name, getattr(other, field.name))
         return self
 
     def delete(self) -> None:
-        self._request("DELETE", self.url_)
+        self._request("DELETE", self._bound_url())
+        cache = self._cache()
+        if cache is not None:
+            cache.invalidate(self.client_id)
+
+    def _cache(self) -> typing.Union[ClientCache, SharedClientCache, None]:
+        return getattr(self.api_, "cache_", None)
+
+
+class ClientInterner:
+    # Shares one OAuth2Client instance per (client_id, updated_at) between all
+    # requests and sessions embedding it, for as long as any of them is
+    # alive. Interned clients are bound to the API rather than to a resource
+    # and have to be treated as read-only; updating one evicts it.
+
+    def __init__(self, api: Resource):
+        self.api = api
+        self.hits = 0
+        self.misses = 0
+        self._clients: weakref.WeakValueDictionary[tuple, OAuth2Client] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, key: tuple) -> typing.Optional[OAuth2Client]:
+        client = self._clients.get(key)
+        if client is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return client
+
+    def set(self, key: tuple, client: OAuth2Client) -> None:
+        self._clients[key] = client
+
+    def evict(self, client: OAuth2Client) -> bool:
+        # Only called on updates, which are rare enough for a scan
+        for key, interned in list(self._clients.items()):
+            if interned is client:
+                del self._clients[key]
+                return True
+        return False
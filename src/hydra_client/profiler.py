@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import collections
+import contextvars
+import functools
+import inspect
+import random
+import threading
+import time
+import typing
+
+F = typing.TypeVar("F", bound=typing.Callable[..., typing.Any])
+
+PHASES = ("network", "decode", "construct", "convert", "bind")
+
+# The profile of the sampled call running in this context, if any
+active_profile: contextvars.ContextVar[typing.Optional[CallProfile]] = (
+    contextvars.ContextVar("active_profile", default=None)
+)
+
+
+class CallProfile:
+    # Attributes elapsed time to the innermost active phase, so nested
+    # phases (e.g. an embedded client decoded by a converter) are exclusive.
+
+    __slots__ = ("name", "phases", "_stack", "_last")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.phases: typing.Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self._stack: typing.List[str] = []
+        self._last = 0.0
+
+    def push(self, phase: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            self.phases[self._stack[-1]] += now - self._last
+        self._stack.append(phase)
+        self._last = now
+
+    def pop(self) -> None:
+        now = time.perf_counter()
+        self.phases[self._stack.pop()] += now - self._last
+        self._last = now
+
+    def timed(
+        self, phase: str, func: typing.Callable[..., typing.Any]
+    ) -> typing.Callable[..., typing.Any]:
+        def wrapper(*args: typing.Any) -> typing.Any:
+            self.push(phase)
+            try:
+                return func(*args)
+            finally:
+                self.pop()
+
+        return wrapper
+
+    def timed_iter(
+        self, phase: str, iterable: typing.Iterable[typing.Any]
+    ) -> typing.Iterator[typing.Any]:
+        iterator = iter(iterable)
+        while True:
+            self.push(phase)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.pop()
+            yield item
+
+
+class CallProfiler:
+    # Samples calls of the API it's passed to and aggregates the time spent
+    # per phase and call. Calls that aren't sampled only pay for a random
+    # number, the models' code paths check for an active profile.
+
+    def __init__(self, sample_rate: float = 0.01):
+        self.sample_rate = sample_rate
+        self.calls: typing.Dict[str, int] = collections.Counter()
+        self.totals: typing.Dict[str, typing.Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def sample(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def record(self, profile: CallProfile) -> None:
+        with self._lock:
+            self.calls[profile.name] += 1
+            totals = self.totals.setdefault(profile.name, dict.fromkeys(PHASES, 0.0))
+            for phase, elapsed in profile.phases.items():
+                totals[phase] += elapsed
+
+    def report(self) -> str:
+        header = "{:<20} {:>7} {:>10}".format("call", "samples", "mean ms")
+        header += "".join(" {:>15}".format(phase) for phase in PHASES)
+        lines = [header]
+        with self._lock:
+            for name, totals in sorted(self.totals.items()):
+                calls = self.calls[name]
+                total = sum(totals.values())
+                line = "{:<20} {:>7} {:>10.3f}".format(name, calls, total / calls * 1e3)
+                for phase in PHASES:
+                    share = totals[phase] / total * 100 if total else 0.0
+                    line += " {:>8.3f} {:>5.1f}%".format(
+                        totals[phase] / calls * 1e3, share
+                    )
+                lines.append(line)
+        return "\n".join(lines) + "\n"
+
+
+def profiled(func: F) -> F:
+    # Profiles a sampled share of the calls of an API method with a
+    # profiler. Generators are only profiled while they run, not while the
+    # caller consumes their items.
+    name = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            profiler = self.profiler_
+            if profiler is None or not profiler.sample():
+                yield from func(self, *args, **kwargs)
+                return
+            profile = CallProfile(name)
+            iterator = func(self, *args, **kwargs)
+            try:
+                while True:
+                    token = active_profile.set(profile)
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        active_profile.reset(token)
+                    yield item
+            finally:
+                iterator.close()
+            profiler.record(profile)
+
+        return typing.cast(F, generator_wrapper)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler_
+        if profiler is None or not profiler.sample():
+            return func(self, *args, **kwargs)
+        profile = CallProfile(name)
+        token = active_profile.set(profile)
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            active_profile.reset(token)
+        profiler.record(profile)
+        return result
+
+    return typing.cast(F, wrapper)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import threading
+import typing
+
+from .oauth2 import OAuth2Client
+from .snapshot import ClientSnapshot
+
+if typing.TYPE_CHECKING:
+    from .api import HydraAdmin
+
+logger = logging.getLogger(__name__)
+
+ChangeCallback = typing.Callable[
+    [typing.Optional[OAuth2Client], typing.Optional[OAuth2Client]], None
+]
+
+
+class OAuth2ClientRegistry:
+    def __init__(self, api: HydraAdmin, interval: float = 60.0, page_size: int = 500):
+        self.api = api
+        self.interval = interval
+        self.page_size = page_size
+        self._clients: typing.Dict[str, OAuth2Client] = {}
+        self._callbacks: typing.List[ChangeCallback] = []
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, client_id: object) -> bool:
+        return client_id in self._clients
+
+    def __iter__(self) -> typing.Iterator[OAuth2Client]:
+        return iter(list(self._clients.values()))
+
+    def get(self, client_id: str) -> typing.Optional[OAuth2Client]:
+        return self._clients.get(client_id)
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        # Callbacks are called with (old, new); old is None for added and new
+        # is None for removed clients.
+        self._callbacks.append(callback)
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            clients = {}
+            changes = []
+            # Only the clients that changed since the last refresh are decoded
+            # to models, the others are compared by their updated_at.
+            version = OAuth2Client._record_decoder(("client_id", "updated_at"))
+            decode = OAuth2Client._decoder(self.api)
+            for page in OAuth2Client._pages(self.api, self.page_size, 1, False, list):
+                for data in page:
+                    client_id, updated_at = version(data)
+                    client = known = self._clients.get(client_id)
+                    if known is None or known.updated_at != updated_at:
+                        client = decode(data)
+                        changes.append((known, client))
+                    clients[client_id] = client
+            for client_id, known in self._clients.items():
+                if client_id not in clients:
+                    changes.append((known, None))
+            # Swap the whole mapping so readers never see a partial refresh
+            self._clients = clients
+
+        for old, new in changes:
+            self._notify(old, new)
+
+    def save_snapshot(self, path: str) -> None:
+        ClientSnapshot(path).save(self, self.api.version())
+
+    def load_snapshot(self, path: str) -> None:
+        clients = {c.client_id: c for c in ClientSnapshot(path).load(self.api)}
+        with self._refresh_lock:
+            self._clients = clients
+        for client in clients.values():
+            self._notify(None, client)
+
+    def _notify(
+        self, old: typing.Optional[OAuth2Client], new: typing.Optional[OAuth2Client]
+    ) -> None:
+        # A failing callback must neither keep the others from seeing the
+        # change nor abort the refresh.
+        for callback in self._callbacks:
+            try:
+                callback(old, new)
+            except Exception:
+                logger.exception("OAuth2 client registry callback %r failed", callback)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="OAuth2ClientRegistry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        # A registry loaded from a snapshot can serve lookups right away and
+        # only has to catch up after the first interval.
+        delay = self.interval if self._clients else 0.0
+        while not self._stopped.wait(delay):
+            try:
+                self.refresh()
+            except Exception:
+                # Keeps refreshing after errors that aren't Hydra's, such as a
+                # response that can't be decoded
+                logger.exception("Refreshing the OAuth2 client registry failed")
+            delay = self.interval
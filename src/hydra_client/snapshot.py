@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+import sqlite3
+import typing
+
+from .oauth2 import OAuth2Client
+from .utils import parse_datetime
+
+if typing.TYPE_CHECKING:
+    from .api import HydraAdmin
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS clients (client_id TEXT PRIMARY KEY, data BLOB NOT NULL);
+"""
+
+
+class ClientSnapshot:
+    def __init__(self, path: str):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _meta(self, key: str) -> typing.Optional[str]:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+    @property
+    def version(self) -> typing.Optional[str]:
+        return self._meta("version")
+
+    @property
+    def created_at(self) -> typing.Optional[datetime]:
+        value = self._meta("created_at")
+        return parse_datetime(value) if value else None
+
+    def save(self, clients: typing.Iterable[OAuth2Client], version: str) -> None:
+        rows = (
+            (c.client_id, json.dumps(c._to_dict(), separators=(",", ":")))
+            for c in clients
+        )
+        created_at = datetime.now(timezone.utc).isoformat()
+        connection = self._connect()
+        try:
+            # Replace the previous snapshot atomically, so concurrent readers
+            # see either the old or the new one.
+            with connection:
+                connection.execute("DELETE FROM clients")
+                connection.executemany("INSERT INTO clients VALUES (?, ?)", rows)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    [("version", version), ("created_at", created_at)],
+                )
+        finally:
+            connection.close()
+
+    def load(self, api: HydraAdmin) -> typing.Iterator[OAuth2Client]:
+        connection = self._connect()
+        try:
+            for (data,) in connection.execute("SELECT data FROM clients"):
+                yield OAuth2Client._from_dict(json.loads(data), parent=api)
+        finally:
+            connection.close()
@@ -0,0 +1,530 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import sys
+import threading
+import time
+import typing
+import uuid
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+
+import attr
+import requests
+
+from .api import HydraAdmin
+from .utils import map_concurrently
+
+Payload = typing.Any
+Route = typing.Callable[[dict, typing.Any], typing.Tuple[int, Payload]]
+
+NOT_FOUND = {"error": "Not Found", "status_code": 404}
+
+
+def client_payload(client_id: str, **kwargs: typing.Any) -> dict:
+    payload = {
+        "client_id": client_id,
+        "client_name": "",
+        "redirect_uris": ["http://client.localhost"],
+        "grant_types": ["authorization_code"],
+        "response_types": ["code"],
+        "scope": "offline_access offline openid",
+        "audience": [],
+        "owner": "",
+        "policy_uri": "",
+        "allowed_cors_origins": [],
+        "tos_uri": "",
+        "client_uri": "",
+        "logo_uri": "",
+        "contacts": None,
+        "client_secret_expires_at": 0,
+        "subject_type": "public",
+        "token_endpoint_auth_method": "client_secret_basic",
+        "userinfo_signed_response_alg": "none",
+        "created_at": "2019-06-11T19:32:34Z",
+        "updated_at": "2019-06-11T19:32:34Z",
+    }
+    payload.update(kwargs)
+    return payload
+
+
+def build_response(
+    request: requests.PreparedRequest,
+    status: int,
+    body: bytes,
+    headers: typing.Mapping[str, str],
+    reason: str = None,
+) -> requests.Response:
+    # The body is read from memory, also when the response is streamed
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = request.url
+    response.request = request
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class AdminAdapter(requests.adapters.BaseAdapter):
+    def admin(self, url: str = "http://localhost:4445", **kwargs) -> HydraAdmin:
+        session = requests.Session()
+        # Proxy settings don't apply to an in-process adapter, and looking
+        # them up in the environment takes more time than serving a request
+        session.trust_env = False
+        session.mount(url, self)
+        return HydraAdmin(url, session=session, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeHydra(AdminAdapter):
+    # In-process stand-in for the Hydra admin API, mounted as a transport
+    # adapter of a requests session. Login and logout flows are started with
+    # start_login() and start_logout(), which take the place of the browser
+    # visiting Hydra's public endpoints. An optional latency is added to
+    # every response to simulate the network.
+
+    def __init__(self, public_url: str = "http://localhost:4444", latency: float = 0.0):
+        super().__init__()
+        self.public_url = public_url.rstrip("/")
+        self.latency = latency
+        self.clients: typing.Dict[str, dict] = {}
+        self.login_requests: typing.Dict[str, dict] = {}
+        self.consent_requests: typing.Dict[str, dict] = {}
+        self.logout_requests: typing.Dict[str, dict] = {}
+        self.consent_sessions: typing.List[dict] = []
+        self.login_sessions: typing.Dict[str, str] = {}
+        self._verifiers: typing.Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._routes: typing.Dict[typing.Tuple[str, str], Route] = {
+            ("GET", "/version"): self._version,
+            ("GET", "/clients"): self._list_clients,
+            ("POST", "/clients"): self._create_client,
+            ("GET", "/oauth2/auth/requests/login"): self._get_login,
+            ("PUT", "/oauth2/auth/requests/login/accept"): self._accept_login,
+            ("PUT", "/oauth2/auth/requests/login/reject"): self._reject_login,
+            ("GET", "/oauth2/auth/requests/consent"): self._get_consent,
+            ("PUT", "/oauth2/auth/requests/consent/accept"): self._accept_consent,
+            ("PUT", "/oauth2/auth/requests/consent/reject"): self._reject_consent,
+            ("GET", "/oauth2/auth/requests/logout"): self._get_logout,
+            ("PUT", "/oauth2/auth/requests/logout/accept"): self._accept_logout,
+            ("PUT", "/oauth2/auth/requests/logout/reject"): self._reject_logout,
+            ("DELETE", "/oauth2/auth/sessions/login"): self._invalidate_logins,
+            ("GET", "/oauth2/auth/sessions/consent"): self._list_consents,
+            ("DELETE", "/oauth2/auth/sessions/consent"): self._revoke_consents,
+        }
+
+    def add_client(self, client_id: str, **kwargs: typing.Any) -> dict:
+        with self._lock:
+            client = self.clients[client_id] = client_payload(client_id, **kwargs)
+        return client
+
+    def start_login(
+        self,
+        client_id: str,
+        scope: typing.Sequence[str] = ("openid", "offline"),
+        audience: typing.Sequence[str] = (),
+    ) -> str:
+        challenge = uuid.uuid4().hex
+        query = urlencode(
+            {"client_id": client_id, "response_type": "code", "scope": " ".join(scope)}
+        )
+        with self._lock:
+            self.login_requests[challenge] = {
+                "challenge": challenge,
+                "client": self.clients[client_id],
+                "oidc_context": {},
+                "request_url": "{}/oauth2/auth?{}".format(self.public_url, query),
+                "requested_access_token_audience": list(audience),
+                "requested_scope": list(scope),
+                "session_id": str(uuid.uuid4()),
+                "skip": False,
+                "subject": "",
+            }
+        return challenge
+
+    def start_logout(self, subject: str) -> str:
+        challenge = str(uuid.uuid4())
+        with self._lock:
+            self.logout_requests[challenge] = {
+                "request_url": "/oauth2/sessions/logout",
+                "rp_initiated": False,
+                "sid": self.login_sessions.get(subject, ""),
+                "subject": subject,
+            }
+        return challenge
+
+    def follow(self, redirect_to: str) -> str:
+        # Returns the consent challenge the browser is sent to after a login
+        # was accepted
+        params = parse_qs(urlsplit(redirect_to).query)
+        with self._lock:
+            return self._verifiers.pop(params["login_verifier"][0])
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        url = urlsplit(request.url)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = "/" + url.path.strip("/")
+        route = self._routes.get((request.method, path))
+        data = json.loads(request.body) if request.body else None
+        with self._lock:
+            if route is not None:
+                status, payload = route(params, data)
+            elif path.startswith("/clients/"):
+                status, payload = self._client(request.method, path[9:], data)
+            else:
+                status, payload = 404, NOT_FOUND
+        if self.latency:
+            time.sleep(self.latency)
+
+        if payload is None:
+            return build_response(request, status, b"", {"Content-Length": "0"})
+        body = json.dumps(payload).encode()
+        headers = {"Content-Length": str(len(body)), "Content-Type": "application/json"}
+        return build_response(request, status, body, headers)
+
+    def _redirect(self, **params: str) -> dict:
+        return {
+            "redirect_to": "{}/oauth2/auth?{}".format(
+                self.public_url, urlencode(params)
+            )
+        }
+
+    def _version(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        return 200, {"version": "v1.0.0"}
+
+    def _list_clients(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        clients = list(self.clients.values())
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", len(clients)))
+        return 200, clients[offset:][:limit]
+
+    def _create_client(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        client_id = data.pop("client_id", None) or str(uuid.uuid4())
+        if client_id in self.clients:
+            return 409, {"error": "Conflict", "status_code": 409}
+        client = self.clients[client_id] = client_payload(client_id, **data)
+        return 201, client
+
+    def _client(
+        self, method: str, client_id: str, data: typing.Optional[dict]
+    ) -> typing.Tuple[int, Payload]:
+        client = self.clients.get(client_id)
+        if client is None:
+            return 404, NOT_FOUND
+        if method == "GET":
+            return 200, client
+        if method == "PUT":
+            client.update(data or {})
+            return 200, client
+        if method == "DELETE":
+            del self.clients[client_id]
+            return 204, None
+        return 405, {"error": "Method Not Allowed", "status_code": 405}
+
+    def _get_login(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        login_request = self.login_requests.get(params.get("login_challenge"))
+        if login_request is None:
+            return 404, NOT_FOUND
+        return 200, login_request
+
+    def _accept_login(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        login_request = self.login_requests.pop(params.get("login_challenge"), None)
+        if login_request is None:
+            return 404, NOT_FOUND
+        subject = data["subject"]
+        if data.get("remember"):
+            self.login_sessions[subject] = login_request["session_id"]
+        challenge = uuid.uuid4().hex
+        self.consent_requests[challenge] = {
+            "acr": data.get("acr", ""),
+            "challenge": challenge,
+            "client": login_request["client"],
+            "context": data.get("context", {}),
+            "login_challenge": login_request["challenge"],
+            "login_session_id": login_request["session_id"],
+            "oidc_context": login_request["oidc_context"],
+            "request_url": login_request["request_url"],
+            "requested_access_token_audience": login_request[
+                "requested_access_token_audience"
+            ],
+            "requested_scope": login_request["requested_scope"],
+            "skip": False,
+            "subject": subject,
+        }
+        verifier = uuid.uuid4().hex
+        self._verifiers[verifier] = challenge
+        return 200, self._redirect(login_verifier=verifier)
+
+    def _reject_login(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        if self.login_requests.pop(params.get("login_challenge"), None) is None:
+            return 404, NOT_FOUND
+        return 200, self._redirect(error=data.get("error", "access_denied"))
+
+    def _get_consent(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        consent_request = self.consent_requests.get(params.get("consent_challenge"))
+        if consent_request is None:
+            return 404, NOT_FOUND
+        return 200, consent_request
+
+    def _accept_consent(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        consent_request = self.consent_requests.pop(
+            params.get("consent_challenge"), None
+        )
+        if consent_request is None:
+            return 404, NOT_FOUND
+        if data.get("remember"):
+            self.consent_sessions.append(
+                {
+                    "consent_request": consent_request,
+                    "grant_access_token_audience": data.get(
+                        "grant_access_token_audience", []
+                    ),
+                    "grant_scope": data.get("grant_scope", []),
+                    "remember": True,
+                    "remember_for": data.get("remember_for", 0),
+                    "session": data.get("session"),
+                }
+            )
+        return 200, self._redirect(consent_verifier=uuid.uuid4().hex)
+
+    def _reject_consent(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        if self.consent_requests.pop(params.get("consent_challenge"), None) is None:
+            return 404, NOT_FOUND
+        return 200, self._redirect(error=data.get("error", "access_denied"))
+
+    def _get_logout(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        # Hydra doesn't include the challenge in logout requests
+        logout_request = self.logout_requests.get(params.get("logout_challenge"))
+        if logout_request is None:
+            return 404, NOT_FOUND
+        return 200, logout_request
+
+    def _accept_logout(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        logout_request = self.logout_requests.pop(params.get("logout_challenge"), None)
+        if logout_request is None:
+            return 404, NOT_FOUND
+        self.login_sessions.pop(logout_request["subject"], None)
+        return 200, {"redirect_to": self.public_url + "/oauth2/sessions/logout"}
+
+    def _reject_logout(self, params: dict, data: dict) -> typing.Tuple[int, Payload]:
+        if self.logout_requests.pop(params.get("logout_challenge"), None) is None:
+            return 404, NOT_FOUND
+        return 204, None
+
+    def _invalidate_logins(
+        self, params: dict, data: None
+    ) -> typing.Tuple[int, Payload]:
+        self.login_sessions.pop(params.get("subject"), None)
+        return 204, None
+
+    def _matching_consents(self, params: dict) -> typing.List[dict]:
+        return [
+            s
+            for s in self.consent_sessions
+            if s["consent_request"]["subject"] == params.get("subject")
+            and params.get("client")
+            in (None, s["consent_request"]["client"]["client_id"])
+        ]
+
+    def _list_consents(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        sessions = self._matching_consents(params)
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", len(sessions)))
+        return 200, sessions[offset:][:limit]
+
+    def _revoke_consents(self, params: dict, data: None) -> typing.Tuple[int, Payload]:
+        revoked = self._matching_consents(params)
+        self.consent_sessions = [s for s in self.consent_sessions if s not in revoked]
+        return 204, None
+
+
+class UnmatchedRequest(LookupError):
+    pass
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class RecordedResponse:
+    status: int
+    reason: str
+    headers: typing.Dict[str, str]
+    body: bytes
+
+
+def interaction_key(method: str, url: str) -> typing.Tuple[str, str, tuple]:
+    # Query parameters may be encoded in any order
+    parts = urlsplit(url)
+    query = tuple(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return method.upper(), parts._replace(query="", fragment="").geturl(), query
+
+
+class CassetteReplay(AdminAdapter):
+    # Serves the interactions recorded in betamax cassettes from memory
+    # instead of sockets; the requests session still prepares the requests.
+    # Requests are matched on method and URL; repeated requests get the
+    # recorded responses in order and, with `repeat`, start over once all of
+    # them were served.
+
+    def __init__(self, *paths: str, repeat: bool = True):
+        super().__init__()
+        self.repeat = repeat
+        self.interactions: typing.List[typing.Tuple[str, str, RecordedResponse]] = []
+        self._responses: typing.Dict[tuple, typing.List[RecordedResponse]] = {}
+        self._positions: typing.Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        for path in paths:
+            self.load(path)
+
+    def load(self, path: str) -> None:
+        with open(path) as f:
+            cassette = json.load(f)
+        for interaction in cassette["http_interactions"]:
+            request, response = interaction["request"], interaction["response"]
+            body = response["body"]
+            if "base64_string" in body:
+                content = base64.b64decode(body["base64_string"])
+            else:
+                content = body.get("string", "").encode(body.get("encoding") or "utf-8")
+            recorded = RecordedResponse(
+                status=response["status"]["code"],
+                reason=response["status"]["message"],
+                headers={k: ", ".join(v) for k, v in response["headers"].items()},
+                body=content,
+            )
+            self.interactions.append((request["method"], request["uri"], recorded))
+            key = interaction_key(request["method"], request["uri"])
+            self._responses.setdefault(key, []).append(recorded)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = interaction_key(request.method, request.url)
+        with self._lock:
+            responses = self._responses.get(key)
+            if responses is None:
+                raise UnmatchedRequest(
+                    "No recorded interaction for {} {}".format(
+                        request.method, request.url
+                    )
+                )
+            position = self._positions.get(key, 0)
+            if position == len(responses):
+                if not self.repeat:
+                    raise UnmatchedRequest(
+                        "All recorded interactions for {} {} were replayed".format(
+                            request.method, request.url
+                        )
+                    )
+                position = 0
+            self._positions[key] = position + 1
+        recorded = responses[position]
+        return build_response(
+            request, recorded.status, recorded.body, recorded.headers, recorded.reason
+        )
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._positions.clear()
+
+
+def login_consent_flow(
+    hydra: HydraAdmin, fake: FakeHydra, client_id: str, subject: str
+) -> None:
+    login_request = hydra.login_request(fake.start_login(client_id))
+    redirect_to = login_request.accept(subject=subject, remember=True)
+    consent_request = hydra.consent_request(fake.follow(redirect_to))
+    consent_request.accept(
+        grant_access_token_audience=consent_request.requested_access_token_audience,
+        grant_scope=consent_request.requested_scope,
+        remember=True,
+    )
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class LoadReport:
+    flows: int
+    errors: int
+    concurrency: int
+    elapsed: float
+    latencies: typing.List[float] = attr.ib(repr=False)
+
+    @property
+    def throughput(self) -> float:
+        return self.flows / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        # Nearest rank of the successful flows' latencies
+        if not self.latencies:
+            return 0.0
+        rank = max(int(round(p / 100 * len(self.latencies))), 1)
+        return self.latencies[rank - 1]
+
+    def format(self) -> str:
+        return (
+            "{} flows ({} errors) at concurrency {} in {:.2f}s: {:.1f} flows/s, "
+            "p50 {:.2f} ms, p99 {:.2f} ms".format(
+                self.flows,
+                self.errors,
+                self.concurrency,
+                self.elapsed,
+                self.throughput,
+                self.percentile(50) * 1e3,
+                self.percentile(99) * 1e3,
+            )
+        )
+
+
+def run_load(
+    hydra: HydraAdmin, fake: FakeHydra, flows: int, concurrency: int = 1
+) -> LoadReport:
+    # Drives login -> accept -> consent -> accept flows, each from its own
+    # client and subject, and measures the latency of each flow.
+    clients = ["load-client-{:04d}".format(i) for i in range(min(flows, 100))]
+    for client_id in clients:
+        fake.add_client(client_id)
+
+    def flow(i: int) -> float:
+        start = time.perf_counter()
+        login_consent_flow(
+            hydra, fake, clients[i % len(clients)], "subject-{:06d}".format(i)
+        )
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = map_concurrently(flow, range(flows), concurrency)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(r for r in results if isinstance(r, float))
+    return LoadReport(
+        flows=flows,
+        errors=flows - len(latencies),
+        concurrency=concurrency,
+        elapsed=elapsed,
+        latencies=latencies,
+    )
+
+
+def main(argv: typing.Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run login/consent flows against an in-process fake Hydra"
+    )
+    parser.add_argument("--flows", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="simulated network latency per request in seconds",
+    )
+    args = parser.parse_args(argv)
+
+    fake = FakeHydra(latency=args.latency)
+    report = run_load(fake.admin(), fake, args.flows, args.concurrency)
+    print(report.format())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,14 @@
+import concurrent.futures
+from datetime import datetime, timedelta, timezone
+import re
+import typing
+
+import dateutil.parser
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
 def filter_none(data: dict) -> dict:
     return {k: v for k, v in data.items() if v is not None}
 
@@ -6,3 +17,50 @@ def urljoin(url: str, *parts: str) -> str:
     return "/".join(
         (url.rstrip("/"), *(p.strip("/") for p in parts[:-1]), (parts[-1]).lstrip("/"))
     )
+
+
+RFC3339_RE = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)[Tt ](\d\d):(\d\d):(\d\d)(?:\.(\d+))?"
+    r"(?:([Zz])|([+-])(\d\d):(\d\d))$"
+)
+
+
+def parse_datetime(value: typing.Union[str, datetime]) -> datetime:
+    # Hydra emits RFC 3339 timestamps, which are parsed by a strict regex.
+    # Anything else is left to the much slower dateutil parser.
+    if isinstance(value, datetime):
+        return value
+    match = RFC3339_RE.match(value)
+    if match is None:
+        return dateutil.parser.parse(value)
+    year, month, day, hour, minute, second, fraction, utc, sign, hh, mm = match.groups()
+    if utc:
+        tz = timezone.utc
+    else:
+        offset = timedelta(hours=int(hh), minutes=int(mm))
+        tz = timezone(-offset if sign == "-" else offset)
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        int(fraction[:6].ljust(6, "0")) if fraction else 0,
+        tz,
+    )
+
+
+def map_concurrently(
+    func: typing.Callable[[T], R], items: typing.Iterable[T], concurrency: int
+) -> typing.List[typing.Union[R, Exception]]:
+    # Errors, including those of malformed items, are returned in place of
+    # the result, so a failing item doesn't abort the rest of the batch.
+    def call(item: T) -> typing.Union[R, Exception]:
+        try:
+            return func(item)
+        except Exception as exc:
+            return exc
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(call, items))
@@ -12,14 +12,14 @@ if typing.TYPE_CHECKING:
     from .api import HydraAdmin
 
 
-@attr.s(auto_attribs=True, kw_only=True)
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
 class Version(Resource):
 
-    url_ = "/version"
+    path_ = "/version"
 
     @classmethod
     def _get(cls, api: HydraAdmin) -> str:
-        url = urljoin(api.url_, cls.url_)
+        url = urljoin(api.url_, cls.path_)
         response = api._request("GET", url)
-        payload = response.json()
+        payload = api._decode(response)
         return payload["version"]
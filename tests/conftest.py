@@ -1,12 +1,14 @@
 import os
-from urllib.parse import urlsplit, parse_qs
+from urllib.parse import urlencode, urlsplit, parse_qs, parse_qsl
 
 import betamax
 import pytest
+import requests
 from betamax.fixtures.pytest import _casette_name
 from requests_oauthlib import OAuth2Session
 
 from hydra_client import HydraAdmin
+from hydra_client.testing import client_payload, FakeHydra
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -58,6 +60,20 @@ def hydra_admin(betamax_session):
     return HydraAdmin("http://localhost:4445", session=betamax_session)
 
 
+@pytest.fixture
+def cassette_hydra_admin(request):
+    # Replays an existing cassette instead of the one named after the test
+    def factory(cassette_name, **kwargs):
+        session = requests.Session()
+        recorder = betamax.Betamax(session)
+        recorder.use_cassette(cassette_name, record="none")
+        recorder.start()
+        request.addfinalizer(recorder.stop)
+        return HydraAdmin("http://localhost:4445", session=session, **kwargs)
+
+    return factory
+
+
 @pytest.fixture
 def login_request(hydra_admin, login_challenge):
     return hydra_admin.login_request(login_challenge)
@@ -105,3 +121,76 @@ def logout_request(hydra_admin, logout_challenge):
 @pytest.fixture
 def oauth2_client(hydra_admin):
     return hydra_admin.create_client()
+
+
+def consent_session_payload(challenge, subject="foobar", client_id="test-client"):
+    return {
+        "grant_scope": ["openid"],
+        "grant_access_token_audience": [],
+        "session": None,
+        "remember": True,
+        "remember_for": 0,
+        "consent_request": {
+            "challenge": challenge,
+            "requested_scope": ["openid"],
+            "requested_access_token_audience": [],
+            "skip": False,
+            "subject": subject,
+            "oidc_context": {},
+            "client": client_payload(client_id),
+            "request_url": "http://localhost:4444/oauth2/auth",
+            "login_challenge": "login-" + challenge,
+            "login_session_id": "session-" + challenge,
+            "acr": "",
+        },
+    }
+
+
+# FakeHydra preloaded with clients and consent sessions, which records the
+# requests it receives
+class FakeClientAdapter(FakeHydra):
+    # Set to False to ignore limit and offset, like a server without paging
+    paginate = True
+    # Caps the limit of list requests, like Hydra does at 500
+    max_limit = None
+
+    def __init__(self, clients, consent_sessions=()):
+        super().__init__()
+        self.clients = {c["client_id"]: c for c in clients}
+        self.consent_sessions = list(consent_sessions)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        url = urlsplit(request.url)
+        query = parse_qsl(url.query)
+        if not self.paginate:
+            query = [(k, v) for k, v in query if k not in ("limit", "offset")]
+        elif self.max_limit is not None:
+            query = [
+                (k, str(min(int(v), self.max_limit)) if k == "limit" else v)
+                for k, v in query
+            ]
+        request = request.copy()
+        request.url = url._replace(query=urlencode(query)).geturl()
+        return super().send(request, **kwargs)
+
+    def _create_client(self, params, data):
+        # Unlike Hydra, client ids are required, so tests can provoke errors
+        if "client_id" not in data:
+            return 400, {"error": "Bad Request", "status_code": 400}
+        return super()._create_client(params, data)
+
+
+@pytest.fixture
+def fake_client_adapter():
+    clients = [client_payload("client-{:04d}".format(i)) for i in range(250)]
+    consent_sessions = [
+        consent_session_payload("challenge-{:04d}".format(i)) for i in range(25)
+    ]
+    return FakeClientAdapter(clients, consent_sessions)
+
+
+@pytest.fixture
+def fake_hydra_admin(fake_client_adapter):
+    return fake_client_adapter.admin()
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from hydra_client import exceptions
+from hydra_client.aio import (
+    AsyncConsentRequest,
+    AsyncConsentSession,
+    AsyncHydraAdmin,
+    AsyncLoginRequest,
+    AsyncOAuth2Client,
+)
+from hydra_client.consent import ConsentSession
+from hydra_client.login import LoginRequest
+from hydra_client.oauth2 import OAuth2Client
+
+from conftest import client_payload, consent_session_payload
+
+
+def cassette_transport(name):
+    path = os.path.join(os.path.dirname(__file__), "cassettes", name + ".json")
+    with open(path) as fp:
+        interactions = json.load(fp)["http_interactions"]
+
+    def handler(request):
+        # Replay the most recent recording of a request
+        for interaction in reversed(interactions):
+            recorded = interaction["request"]
+            if (recorded["method"], recorded["uri"]) == (
+                request.method,
+                str(request.url),
+            ):
+                response = interaction["response"]
+                return httpx.Response(
+                    response["status"]["code"],
+                    content=response["body"]["string"].encode(),
+                )
+        return httpx.Response(599)
+
+    return httpx.MockTransport(handler)
+
+
+def async_admin(cassette):
+    session = httpx.AsyncClient(transport=cassette_transport(cassette))
+    return AsyncHydraAdmin("http://localhost:4445", session=session)
+
+
+def test_login_request_accept():
+    async def run():
+        hydra_admin = async_admin("test_login.test_login_request_accept")
+        login_request = await hydra_admin.login_request(
+            "af3f599180ca41acad0514326176c03d"
+        )
+        assert isinstance(login_request, AsyncLoginRequest)
+        assert isinstance(login_request, LoginRequest)
+        assert isinstance(login_request.client, AsyncOAuth2Client)
+        assert login_request.client.parent_ is login_request
+        return await login_request.accept("subject")
+
+    redirect = asyncio.run(run())
+    assert redirect.startswith("http"), redirect
+
+
+def test_list_consent_sessions():
+    async def run():
+        hydra_admin = async_admin("test_consent.test_list_consent_sessions")
+        return [s async for s in hydra_admin.consent_sessions("foobar", None)]
+
+    session_list = asyncio.run(run())
+    assert session_list
+    assert all(isinstance(s, ConsentSession) for s in session_list)
+    consent_session = session_list[0]
+    assert isinstance(consent_session, AsyncConsentSession)
+    assert isinstance(consent_session.consent_request, AsyncConsentRequest)
+
+
+def test_list_consent_sessions_paginated():
+    sessions = [consent_session_payload("challenge-{}".format(i)) for i in range(5)]
+    offsets = []
+
+    def handler(request):
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        offsets.append(offset)
+        return httpx.Response(200, json=sessions[offset : offset + limit])
+
+    async def run():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        hydra_admin = AsyncHydraAdmin("http://localhost:4445", session=session)
+        return [s async for s in hydra_admin.consent_sessions("foobar", page_size=2)]
+
+    session_list = asyncio.run(run())
+    assert [s.consent_request.challenge for s in session_list] == [
+        "challenge-{}".format(i) for i in range(5)
+    ]
+    assert offsets == [0, 2, 4]
+
+
+def test_list_consent_sessions_unpaginated_server():
+    sessions = [consent_session_payload("challenge-{}".format(i)) for i in range(5)]
+    requests = []
+
+    def handler(request):
+        # Ignores limit and offset
+        requests.append(request)
+        return httpx.Response(200, json=sessions)
+
+    async def run():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        hydra_admin = AsyncHydraAdmin("http://localhost:4445", session=session)
+        return [s async for s in hydra_admin.consent_sessions("foobar", page_size=2)]
+
+    assert len(asyncio.run(run())) == 5
+    assert len(requests) == 1
+
+
+def test_aclose():
+    async def run():
+        async with AsyncHydraAdmin("http://localhost:4445") as hydra_admin:
+            assert not hydra_admin.session_.is_closed
+        return hydra_admin
+
+    assert asyncio.run(run()).session_.is_closed
+
+
+def test_aclose_session():
+    async def run():
+        session = httpx.AsyncClient(
+            transport=cassette_transport("test_version.test_hydra_version")
+        )
+        async with AsyncHydraAdmin(
+            "http://localhost:4445", session=session
+        ) as hydra_admin:
+            await hydra_admin.version()
+        # The session belongs to the caller
+        assert not session.is_closed
+        await session.aclose()
+
+    asyncio.run(run())
+
+
+def test_client_list():
+    hydra_admin = async_admin("test_oauth2.test_client_list")
+    client_list = asyncio.run(hydra_admin.clients())
+    assert client_list
+    assert all(isinstance(c, OAuth2Client) for c in client_list)
+
+
+def test_iter_clients_raw_global():
+    clients = [client_payload("client-{}".format(i)) for i in range(5)]
+
+    def handler(request):
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json=clients[offset : offset + limit])
+
+    async def run():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        hydra_admin = AsyncHydraAdmin(
+            "http://localhost:4445", session=session, raw="bytes"
+        )
+        return [c async for c in hydra_admin.iter_clients(page_size=2)]
+
+    client_list = asyncio.run(run())
+    assert all(isinstance(c, AsyncOAuth2Client) for c in client_list)
+    assert [c.client_id for c in client_list] == [c["client_id"] for c in clients]
+
+
+def test_client_not_found():
+    hydra_admin = async_admin("test_oauth2.test_client_delete")
+    with pytest.raises(exceptions.NotFound):
+        asyncio.run(hydra_admin.client("e71ec9ba-9881-4882-a6bd-075c3b5e15c6"))
+
+
+def test_hydra_version():
+    hydra_admin = async_admin("test_version.test_hydra_version")
+    version = asyncio.run(hydra_admin.version())
+    assert version.startswith("v1.0."), version
+
+
+def test_delete_clients():
+    hydra_admin = async_admin("test_oauth2.test_client_delete")
+    results = asyncio.run(
+        hydra_admin.delete_clients(
+            ["e71ec9ba-9881-4882-a6bd-075c3b5e15c6", "unknown"], concurrency=2
+        )
+    )
+    assert results[0] is None
+    assert isinstance(results[1], exceptions.HTTPError)
+
+
+def test_create_clients_malformed_spec():
+    created = []
+
+    async def handler(request):
+        # Answers slowly, so the malformed spec fails while others run
+        await asyncio.sleep(0.01)
+        created.append(json.loads(request.content)["client_id"])
+        return httpx.Response(201, json=client_payload(created[-1]))
+
+    async def run():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        hydra_admin = AsyncHydraAdmin("http://localhost:4445", session=session)
+        specs = [{"client_id": "a"}, {"unknown": 1}, {"client_id": "b"}]
+        return await hydra_admin.create_clients(specs, concurrency=3)
+
+    results = asyncio.run(run())
+    assert [c.client_id for c in (results[0], results[2])] == ["a", "b"]
+    assert isinstance(results[1], TypeError)
+    assert sorted(created) == ["a", "b"]
+
+
+def test_accept_login():
+    hydra_admin = async_admin("test_login.test_login_request_accept")
+    redirect = asyncio.run(
+        hydra_admin.accept_login("af3f599180ca41acad0514326176c03d", "subject")
+    )
+    assert redirect.startswith("http"), redirect
+
+
+def test_restore():
+    async def run():
+        hydra_admin = async_admin("test_login.test_login_request_accept")
+        login_request = await hydra_admin.login_request(
+            "af3f599180ca41acad0514326176c03d"
+        )
+        return hydra_admin, login_request, hydra_admin.restore(login_request.dumps())
+
+    hydra_admin, login_request, restored = asyncio.run(run())
+    assert isinstance(restored, AsyncLoginRequest)
+    assert isinstance(restored.client, AsyncOAuth2Client)
+    assert restored == login_request
+    assert restored.parent_ is hydra_admin
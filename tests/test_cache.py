@@ -0,0 +1,135 @@
+import os
+import stat
+import time
+
+import pytest
+import requests
+
+from hydra_client import HydraAdmin
+from hydra_client.cache import ClientCache, SharedClientCache
+from hydra_client.oauth2 import OAuth2Client
+
+from conftest import client_payload
+
+
+@pytest.fixture
+def cache():
+    return ClientCache(maxsize=2, ttl=60)
+
+
+@pytest.fixture
+def cached_hydra_admin(fake_client_adapter, cache):
+    session = requests.Session()
+    session.mount("http://", fake_client_adapter)
+    return HydraAdmin("http://localhost:4445", session=session, cache=cache)
+
+
+def test_client_cached(cached_hydra_admin, fake_client_adapter, cache):
+    client = cached_hydra_admin.client("client-0000")
+    assert cached_hydra_admin.client("client-0000") is client
+    assert len(fake_client_adapter.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_client_cache_lru(cached_hydra_admin, fake_client_adapter, cache):
+    cached_hydra_admin.client("client-0000")
+    cached_hydra_admin.client("client-0001")
+    cached_hydra_admin.client("client-0000")
+    cached_hydra_admin.client("client-0002")
+    assert len(cache) == 2
+    assert cache.get("client-0001") is None
+    assert cache.get("client-0000") is not None
+
+
+def test_client_cache_ttl(cached_hydra_admin, cache):
+    cache.ttl = 0.01
+    cached_hydra_admin.client("client-0000")
+    time.sleep(0.02)
+    assert cache.get("client-0000") is None
+
+
+def test_client_cache_write_through(cached_hydra_admin, fake_client_adapter, cache):
+    client = cached_hydra_admin.create_client(client_id="new-client")
+    assert cached_hydra_admin.client("new-client") is client
+    client.update(client_name="foobar")
+    assert cache.get("new-client").client_name == "foobar"
+    client.delete()
+    assert cache.get("new-client") is None
+    cached_hydra_admin.client("client-0000")
+    cached_hydra_admin.delete_clients(["client-0000"])
+    assert cache.get("client-0000") is None
+
+
+@pytest.fixture
+def shared_cache_path(tmp_path):
+    return str(tmp_path / "clients.db")
+
+
+def test_shared_client_cache(fake_client_adapter, shared_cache_path):
+    session = requests.Session()
+    session.mount("http://", fake_client_adapter)
+    worker_a = HydraAdmin(
+        "http://localhost:4445", session, cache=SharedClientCache(shared_cache_path)
+    )
+    worker_b = HydraAdmin(
+        "http://localhost:4445", session, cache=SharedClientCache(shared_cache_path)
+    )
+    client = worker_a.client("client-0000")
+    fake_client_adapter.requests.clear()
+    cached = worker_b.client("client-0000")
+    assert cached == client
+    assert cached.parent_ is worker_b
+    assert not fake_client_adapter.requests
+    assert (worker_b.cache_.hits, worker_b.cache_.misses) == (1, 0)
+
+    cached.update(client_name="foobar")
+    assert worker_a.client("client-0000").client_name == "foobar"
+    cached.delete()
+    assert worker_a.cache_.get("client-0000") is None
+
+
+def test_shared_client_cache_refresh(fake_hydra_admin, shared_cache_path):
+    cache_a = SharedClientCache(shared_cache_path)
+    cache_b = SharedClientCache(shared_cache_path)
+    assert cache_a.refresh(fake_hydra_admin, interval=60)
+    assert not cache_b.refresh(fake_hydra_admin, interval=60)
+    assert len(cache_b) == 250
+    assert cache_b.get("client-0042").client_id == "client-0042"
+
+
+def test_shared_client_cache_refresh_purge(fake_hydra_admin, shared_cache_path):
+    expired = SharedClientCache(shared_cache_path, ttl=0)
+    expired.set(OAuth2Client._from_dict(client_payload("deleted")))
+    cache = SharedClientCache(shared_cache_path)
+    assert cache.refresh(fake_hydra_admin, interval=60)
+    rows = cache._connection().execute("SELECT COUNT(*) FROM clients").fetchone()
+    assert rows[0] == 250
+
+
+def test_shared_client_cache_private(shared_cache_path):
+    cache = SharedClientCache(shared_cache_path)
+    cache.set(OAuth2Client._from_dict(client_payload("secret", client_secret="s3cr3t")))
+    assert stat.S_IMODE(os.stat(shared_cache_path).st_mode) == 0o600
+    row = cache._connection().execute("SELECT data FROM clients").fetchone()
+    assert b"s3cr3t" not in row[0].encode()
+    assert cache.get("secret").client_secret is None
+
+
+def _fill_shared_cache(cache, client):
+    cache.set(client)
+
+
+def test_shared_client_cache_fork(shared_cache_path):
+    multiprocessing = pytest.importorskip("multiprocessing")
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork is not supported")
+    cache = SharedClientCache(shared_cache_path)
+    assert len(cache) == 0
+    client = OAuth2Client._from_dict(client_payload("forked"))
+    process = multiprocessing.get_context("fork").Process(
+        target=_fill_shared_cache, args=(cache, client)
+    )
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert cache.get("forked") == client
@@ -0,0 +1,101 @@
+import sys
+import threading
+
+import pytest
+
+from hydra_client.catalog import ClientCatalog
+from hydra_client.oauth2 import OAuth2Client
+from hydra_client.registry import OAuth2ClientRegistry
+
+from conftest import client_payload
+
+
+def make_client(client_id, **kwargs):
+    return OAuth2Client._from_dict(client_payload(client_id, **kwargs))
+
+
+@pytest.fixture
+def catalog():
+    return ClientCatalog(
+        [
+            make_client("a", owner="alice", redirect_uris=["http://a"]),
+            make_client("b", owner="alice", redirect_uris=["http://b"]),
+            make_client("c", owner="bob", redirect_uris=None, audience=["api"]),
+        ]
+    )
+
+
+def test_catalog_find(catalog):
+    assert [c.client_id for c in catalog.find(owner="alice")] == ["a", "b"]
+    assert [c.client_id for c in catalog.find(redirect_uris="http://b")] == ["b"]
+    assert [c.client_id for c in catalog.find(owner="bob", audience="api")] == ["c"]
+    assert catalog.find(owner="alice", audience="api") == []
+    assert catalog.find(owner="carol") == []
+    assert len(catalog.find(grant_types="authorization_code")) == 3
+    with pytest.raises(TypeError):
+        catalog.find(client_name="a")
+
+
+def test_catalog_update(catalog):
+    catalog.add(make_client("a", owner="bob", redirect_uris=["http://b"]))
+    assert [c.client_id for c in catalog.find(owner="alice")] == ["b"]
+    assert [c.client_id for c in catalog.find(owner="bob")] == ["a", "c"]
+    assert catalog.find(redirect_uris="http://a") == []
+    assert [c.client_id for c in catalog.find(redirect_uris="http://b")] == ["a", "b"]
+    catalog.remove("b")
+    assert "b" not in catalog
+    assert [c.client_id for c in catalog.find(redirect_uris="http://b")] == ["a"]
+
+
+def test_catalog_update_in_place(catalog):
+    # As done by OAuth2Client.update()
+    client = catalog.get("a")
+    client.owner = "carol"
+    client.redirect_uris = ["http://c"]
+    catalog.add(client)
+    assert [c.client_id for c in catalog.find(owner="alice")] == ["b"]
+    assert [c.client_id for c in catalog.find(owner="carol")] == ["a"]
+    assert catalog.find(redirect_uris="http://a") == []
+    catalog.remove("a")
+    assert catalog.find(owner="carol") == []
+    assert catalog.find(redirect_uris="http://c") == []
+
+
+def test_catalog_from_registry(fake_hydra_admin, fake_client_adapter):
+    registry = OAuth2ClientRegistry(fake_hydra_admin)
+    registry.refresh()
+    catalog = ClientCatalog.from_registry(registry)
+    assert len(catalog) == 250
+    fake_client_adapter.clients["client-0001"].update(
+        owner="alice", updated_at="2020-01-01T00:00:00Z"
+    )
+    del fake_client_adapter.clients["client-0002"]
+    registry.refresh()
+    assert len(catalog) == 249
+    assert [c.client_id for c in catalog.find(owner="alice")] == ["client-0001"]
+
+
+def test_catalog_concurrent_changes(catalog):
+    # Changes from a registry's refresh thread while others look up clients
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stopped = threading.Event()
+    clients = [make_client("shared-{}".format(i), owner="alice") for i in range(50)]
+
+    def churn():
+        while not stopped.is_set():
+            for client in clients:
+                catalog.add(client)
+            for client in clients:
+                catalog.remove(client.client_id)
+
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for _ in range(20000):
+            found = catalog.find(owner="alice", grant_types="authorization_code")
+            assert {"a", "b"} <= {c.client_id for c in found}
+    finally:
+        stopped.set()
+        thread.join()
+        sys.setswitchinterval(interval)
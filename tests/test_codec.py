@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from hydra_client import HydraAdmin
+from hydra_client.codec import iter_array, JSONCodec, OrjsonCodec
+
+PAYLOAD = [
+    {"id": "a", "nested": {"list": [1, 2, {"x": None}]}, "empty": []},
+    {"id": 'quote " and [brackets], {braces}', "path": "C:\\dir\\"},
+    "plain string",
+    42,
+    -1.5e3,
+    None,
+    True,
+    [],
+    {},
+]
+
+
+def chunked(data, size):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 16])
+def test_iter_array(size):
+    data = json.dumps(PAYLOAD).encode()
+    assert list(iter_array(chunked(data, size), json.loads)) == PAYLOAD
+
+
+def test_iter_array_whitespace():
+    data = b'  [\n  {"a": 1} ,\n  {"b": "]"}\n]\n'
+    assert list(iter_array(chunked(data, 1), json.loads)) == [{"a": 1}, {"b": "]"}]
+
+
+def test_iter_array_empty():
+    assert list(iter_array([b"[", b" ", b"]"], json.loads)) == []
+
+
+def test_iter_array_incremental():
+    chunks = iter([b'[{"a": 1},', b'{"b": 2}', b"]"])
+    elements = iter_array(chunks, json.loads)
+    assert next(elements) == {"a": 1}
+    # The first element is decoded before the rest of the body was read
+    assert next(chunks) == b'{"b": 2}'
+
+
+@pytest.mark.parametrize("codec", [JSONCodec(), OrjsonCodec()])
+def test_codec_roundtrip(codec):
+    assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+
+
+class CountingCodec(JSONCodec):
+    def __init__(self):
+        self.calls = 0
+
+    def loads(self, data):
+        self.calls += 1
+        return super().loads(data)
+
+
+def test_hydra_admin_codec(fake_client_adapter):
+    codec = CountingCodec()
+    hydra = HydraAdmin("http://localhost:4445", codec=codec)
+    hydra.session_.mount("http://", fake_client_adapter)
+    clients = hydra.clients(limit=10)
+    assert len(clients) == 10
+    assert codec.calls == 1
+    assert hydra.version() == "v1.0.0"
+    assert codec.calls == 2
+
+
+def test_hydra_admin_codec_stream(fake_client_adapter):
+    codec = CountingCodec()
+    hydra = HydraAdmin("http://localhost:4445", codec=codec)
+    hydra.session_.mount("http://", fake_client_adapter)
+    clients = list(hydra.iter_clients(page_size=100, stream=True))
+    assert clients == list(hydra.iter_clients(page_size=100))
+    # Each element of a streamed array is decoded on its own
+    assert codec.calls == 250 + 3
+
+
+def test_restore_codec(fake_client_adapter):
+    codec = CountingCodec()
+    hydra = HydraAdmin("http://localhost:4445", codec=codec)
+    hydra.session_.mount("http://", fake_client_adapter)
+    client = hydra.client("client-0000")
+    data = client.dumps()
+    codec.calls = 0
+    assert hydra.restore(data) == client
+    assert codec.calls == 1
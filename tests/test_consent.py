@@ -1,3 +1,6 @@
+import gc
+
+from hydra_client import HydraAdmin
 from hydra_client.common import OpenIDConnectContext
 from hydra_client.consent import ConsentRequest, ConsentSession
 from hydra_client.oauth2 import OAuth2Client
@@ -5,6 +8,8 @@ from hydra_client.oauth2 import OAuth2Client
 from urllib.parse import parse_qs, urlsplit
 import pytest
 
+from conftest import client_payload, consent_session_payload
+
 
 def test_consent_request_create(hydra_admin, consent_challenge):
     consent_request = hydra_admin.consent_request(consent_challenge)
@@ -26,7 +31,7 @@ def test_consent_request_reject(consent_request):
 
 
 def test_list_consent_sessions(hydra_admin, accepted_consent_request):
-    session_iter = hydra_admin.consent_sessions(accepted_consent_request.subject)
+    session_iter = hydra_admin.consent_sessions(accepted_consent_request.subject, None)
     session_list = list(session_iter)
     assert session_list
     assert all(isinstance(c, ConsentSession) for c in session_list)
@@ -37,7 +42,102 @@ def test_list_consent_sessions(hydra_admin, accepted_consent_request):
     # assert accepted_consent_request in session_list
 
 
+def test_list_consent_sessions_paginated(fake_hydra_admin, fake_client_adapter):
+    session_iter = fake_hydra_admin.consent_sessions("foobar", page_size=10)
+    first = next(session_iter)
+    assert first.consent_request.challenge == "challenge-0000"
+    # Further pages are only requested when the first one has been consumed
+    assert len(fake_client_adapter.requests) == 1
+    session_list = [first] + list(session_iter)
+    assert [s.consent_request.challenge for s in session_list] == [
+        "challenge-{:04d}".format(i) for i in range(25)
+    ]
+    queries = [parse_qs(urlsplit(r.url).query) for r in fake_client_adapter.requests]
+    assert [q["offset"] for q in queries] == [["0"], ["10"], ["20"]]
+    assert all(q["limit"] == ["10"] for q in queries)
+
+
+def test_list_consent_sessions_unpaginated(fake_hydra_admin, fake_client_adapter):
+    assert len(list(fake_hydra_admin.consent_sessions("foobar", None))) == 25
+    assert not list(fake_hydra_admin.consent_sessions("nobody", None))
+    assert "limit" not in fake_client_adapter.requests[0].url
+
+
+def test_list_consent_sessions_default_page_size(fake_hydra_admin, fake_client_adapter):
+    assert len(list(fake_hydra_admin.consent_sessions("foobar"))) == 25
+    assert "limit=100" in fake_client_adapter.requests[0].url
+
+
+def test_list_consent_sessions_capped(fake_client_adapter):
+    fake_client_adapter.consent_sessions = [
+        consent_session_payload("challenge-{:04d}".format(i)) for i in range(250)
+    ]
+    fake_client_adapter.max_limit = 100
+    hydra_admin = fake_client_adapter.admin()
+    session_list = list(hydra_admin.consent_sessions("foobar", page_size=200))
+    assert len(session_list) == 250
+    queries = [parse_qs(urlsplit(r.url).query) for r in fake_client_adapter.requests]
+    assert [q["offset"] for q in queries] == [["0"], ["100"], ["200"]]
+
+
+def test_list_consent_sessions_unpaginated_server(
+    fake_hydra_admin, fake_client_adapter
+):
+    fake_client_adapter.paginate = False
+    session_list = list(fake_hydra_admin.consent_sessions("foobar", page_size=10))
+    assert len(session_list) == 25
+    assert len(fake_client_adapter.requests) == 1
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_list_consent_sessions_interned(fake_client_adapter, lazy):
+    hydra_admin = HydraAdmin("http://localhost:4445", lazy=lazy, intern_clients=True)
+    hydra_admin.session_.mount("http://", fake_client_adapter)
+    session_list = list(hydra_admin.consent_sessions("foobar"))
+    clients = {id(s.consent_request.client) for s in session_list}
+    assert len(clients) == 1
+    client = session_list[0].consent_request.client
+    # Interned clients are bound to the API, not to one of the requests
+    assert client.parent_ is hydra_admin
+    assert client.url_ == "http://localhost:4445/clients/test-client"
+    assert len(hydra_admin.interner_) == 1
+    del session_list, client
+    # Parents and children reference each other, so only the cycle
+    # collector frees them
+    gc.collect()
+    assert len(hydra_admin.interner_) == 0
+
+
+def test_update_interned_client(fake_client_adapter):
+    fake_client_adapter.clients["test-client"] = client_payload("test-client")
+    hydra_admin = HydraAdmin("http://localhost:4445", intern_clients=True)
+    hydra_admin.session_.mount("http://", fake_client_adapter)
+    session_list = list(hydra_admin.consent_sessions("foobar"))
+    client = session_list[0].consent_request.client
+    updated = client.update(client_name="changed")
+    assert updated is not client
+    assert updated.client_name == "changed"
+    assert updated.parent_ is hydra_admin
+    assert session_list[1].consent_request.client.client_name == ""
+    assert len(hydra_admin.interner_) == 0
+    fresh = list(hydra_admin.consent_sessions("foobar"))[0].consent_request.client
+    assert fresh is not client
+
+
+def test_list_consent_sessions_not_interned(fake_hydra_admin):
+    session_list = list(fake_hydra_admin.consent_sessions("foobar"))
+    client = session_list[0].consent_request.client
+    assert client is not session_list[1].consent_request.client
+    assert client.parent_ is session_list[0].consent_request
+
+
 def test_revoke_consent_sessions(hydra_admin, accepted_consent_request):
     hydra_admin.revoke_consent_sessions(accepted_consent_request.subject)
-    session_iter = hydra_admin.consent_sessions(accepted_consent_request.subject)
+    session_iter = hydra_admin.consent_sessions(accepted_consent_request.subject, None)
     assert not list(session_iter)
+
+
+def test_reject_consent(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_consent.test_consent_request_reject")
+    redirect = hydra_admin.reject_consent("b3354a9719f244f780559091db2f0633")
+    assert redirect.startswith("http"), redirect
@@ -1,4 +1,9 @@
+import json
+
+import pytest
+
 from hydra_client.common import OpenIDConnectContext
+from hydra_client.login import LoginRequest
 from hydra_client.oauth2 import OAuth2Client
 
 
@@ -23,3 +28,75 @@ def test_login_request_reject(login_request):
 
 def test_invalidate_login_sessions(hydra_admin, accepted_consent_request):
     hydra_admin.invalidate_login_sessions(accepted_consent_request.subject)
+
+
+def test_accept_login(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_login.test_login_request_accept")
+    redirect = hydra_admin.accept_login("af3f599180ca41acad0514326176c03d", "subject")
+    assert redirect.startswith("http"), redirect
+
+
+def test_reject_login(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_login.test_login_request_reject")
+    redirect = hydra_admin.reject_login("7d5853ac3ee345d5b56891832602270f")
+    assert redirect.startswith("http"), redirect
+
+
+def test_login_request_lazy(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin(
+        "test_login.test_login_request_accept", lazy=True
+    )
+    login_request = hydra_admin.login_request("af3f599180ca41acad0514326176c03d")
+    assert login_request.challenge == "af3f599180ca41acad0514326176c03d"
+    assert not login_request.skip
+    with pytest.raises(AttributeError):
+        # The nested client hasn't been decoded yet
+        object.__getattribute__(login_request, "client")
+    assert isinstance(login_request.client, OAuth2Client)
+    assert login_request.client.parent_ is login_request
+    assert login_request.client.url_.endswith("/clients/test-client")
+    redirect = login_request.accept("subject")
+    assert redirect.startswith("http"), redirect
+
+
+def test_login_request_raw(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin(
+        "test_login.test_login_request_accept", raw="json"
+    )
+    payload = hydra_admin.login_request_raw("af3f599180ca41acad0514326176c03d")
+    assert payload["challenge"] == "af3f599180ca41acad0514326176c03d"
+    assert payload["client"]["client_id"] == "test-client"
+
+
+def test_login_request_raw_bytes(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_login.test_login_request_accept")
+    body = hydra_admin.login_request_raw("af3f599180ca41acad0514326176c03d", "bytes")
+    assert json.loads(body)["challenge"] == "af3f599180ca41acad0514326176c03d"
+
+
+def test_login_request_restore(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_login.test_login_request_accept")
+    login_request = hydra_admin.login_request("af3f599180ca41acad0514326176c03d")
+    data = login_request.dumps()
+    assert isinstance(data, bytes)
+    restored = hydra_admin.restore(data)
+    assert isinstance(restored, LoginRequest)
+    assert restored == login_request
+    assert restored.parent_ is hydra_admin
+    assert restored.client.parent_ is restored
+    # Accepting the restored request doesn't need to fetch it again
+    redirect = restored.accept("subject")
+    assert redirect.startswith("http"), redirect
+
+
+def test_restore_invalid(fake_hydra_admin, cassette_hydra_admin):
+    with pytest.raises(ValueError):
+        fake_hydra_admin.restore(b"\x00")
+    hydra_admin = cassette_hydra_admin("test_login.test_login_request_accept")
+    data = hydra_admin.login_request("af3f599180ca41acad0514326176c03d").dumps()
+    for invalid in (data[:-10], data[:1] + b"\x80\x04", data[:1] + b'["x", 1]'):
+        with pytest.raises(ValueError):
+            fake_hydra_admin.restore(invalid)
+    path = LoginRequest.path_.encode()
+    with pytest.raises(ValueError):
+        fake_hydra_admin.restore(data[:1] + b'["' + path + b'", {}]')
@@ -11,3 +11,16 @@ def test_logout_request_accept(logout_request):
 def test_logout_request_reject(logout_request):
     # Only making sure this is not throwing any exceptions
     logout_request.reject()
+
+
+def test_accept_logout(cassette_hydra_admin):
+    hydra_admin = cassette_hydra_admin("test_logout.test_logout_request_accept")
+    redirect = hydra_admin.accept_logout("a1057f25-73ea-47d8-b38d-2d90b79a9b96")
+    assert redirect.startswith("http"), redirect
+
+
+def test_accept_logout_without_body(fake_hydra_admin, fake_client_adapter):
+    challenge = fake_client_adapter.start_logout("foobar")
+    redirect = fake_hydra_admin.accept_logout(challenge)
+    assert redirect.startswith("http"), redirect
+    assert fake_client_adapter.requests[-1].body is None
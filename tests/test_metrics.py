@@ -0,0 +1,113 @@
+import pytest
+
+from hydra_client import exceptions, HydraAdmin
+from hydra_client.metrics import endpoint_template, RequestHook, RequestMetrics
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("http://localhost:4445/clients", "/clients"),
+        ("http://localhost:4445/clients/client-0001", "/clients/{id}"),
+        (
+            "http://localhost:4445/oauth2/auth/requests/login/accept",
+            "/oauth2/auth/requests/login/accept",
+        ),
+    ],
+)
+def test_endpoint_template(url, endpoint):
+    assert endpoint_template("http://localhost:4445", url) == endpoint
+    prefixed = url.replace("4445/", "4445/admin/")
+    assert endpoint_template("http://localhost:4445/admin/", prefixed) == endpoint
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.started = []
+        self.events = []
+
+    def request_started(self, method, endpoint):
+        self.started.append((method, endpoint))
+
+    def request_finished(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def metrics():
+    return RequestMetrics()
+
+
+@pytest.fixture
+def hook():
+    return RecordingHook()
+
+
+@pytest.fixture
+def instrumented_admin(fake_client_adapter, metrics, hook):
+    hydra = HydraAdmin("http://localhost:4445", hooks=[metrics, hook])
+    hydra.session_.mount("http://", fake_client_adapter)
+    return hydra
+
+
+def test_hook_events(instrumented_admin, hook):
+    client = instrumented_admin.client("client-0001")
+    client.update(owner="me")
+    with pytest.raises(exceptions.NotFound):
+        instrumented_admin.client("unknown")
+    assert hook.started == [
+        ("GET", "/clients/{id}"),
+        ("PUT", "/clients/{id}"),
+        ("GET", "/clients/{id}"),
+    ]
+    get, put, not_found = hook.events
+    assert get.status == 200 and get.exception is None
+    assert get.request_bytes == 0 and get.response_bytes > 0
+    assert put.request_bytes > 0
+    assert not_found.status == 404
+    assert not_found.exception is exceptions.NotFound
+    assert all(event.duration >= 0 for event in hook.events)
+
+
+def test_hook_connection_error(metrics, hook):
+    hydra = HydraAdmin("http://127.0.0.1:9", hooks=[metrics, hook])
+    with pytest.raises(exceptions.ConnectionError):
+        hydra.version()
+    (event,) = hook.events
+    assert event.status is None
+    assert event.exception is exceptions.ConnectionError
+    assert 'exception="ConnectionError"' in metrics.export()
+
+
+def test_metrics_export(instrumented_admin, metrics):
+    instrumented_admin.clients(limit=10)
+    instrumented_admin.client("client-0001")
+    with pytest.raises(exceptions.NotFound):
+        instrumented_admin.client("unknown")
+    text = metrics.export()
+    labels = 'method="GET",endpoint="/clients/{id}"'
+    assert "# TYPE hydra_client_request_duration_seconds histogram" in text
+    assert "hydra_client_request_duration_seconds_count{%s} 2" % labels in text
+    assert (
+        'hydra_client_request_duration_seconds_bucket{%s,le="+Inf"} 2' % labels in text
+    )
+    assert 'hydra_client_responses_total{%s,status="200"} 1' % labels in text
+    assert 'hydra_client_responses_total{%s,status="404"} 1' % labels in text
+    assert 'hydra_client_errors_total{%s,exception="NotFound"} 1' % labels in text
+    assert "hydra_client_requests_in_flight{%s} 0" % labels in text
+    assert 'hydra_client_responses_total{method="GET",endpoint="/clients"' in text
+
+
+def test_metrics_in_flight(fake_client_adapter, metrics):
+    labels = (("method", "GET"), ("endpoint", "/version"))
+    seen = []
+
+    class InFlightHook(RequestHook):
+        def request_started(self, method, endpoint):
+            seen.append(metrics.in_flight[labels])
+
+    hydra = HydraAdmin("http://localhost:4445", hooks=[metrics, InFlightHook()])
+    hydra.session_.mount("http://", fake_client_adapter)
+    hydra.version()
+    assert seen == [1]
+    assert metrics.in_flight[labels] == 0
@@ -0,0 +1,90 @@
+import pytest
+
+from hydra_client import exceptions
+from hydra_client.login import LoginRequest
+from hydra_client.oauth2 import JSONWebKeySet, OAuth2Client
+from hydra_client.model import lazy, ResourceList
+
+from conftest import client_payload
+
+
+def test_from_dict_defaults():
+    payload = client_payload("client", unknown="ignored")
+    client = OAuth2Client._from_dict(payload)
+    assert client.jwks is None
+    assert client.post_logout_redirect_uris == []
+    assert not hasattr(client, "unknown")
+    # Converters run on factory defaults
+    assert isinstance(JSONWebKeySet._from_dict({}).keys, ResourceList)
+
+
+def test_from_dict_missing_field():
+    payload = client_payload("client")
+    del payload["owner"]
+    with pytest.raises(TypeError):
+        OAuth2Client._from_dict(payload)
+
+
+def test_to_dict_roundtrip():
+    client = OAuth2Client._from_dict(client_payload("client"))
+    assert OAuth2Client._from_dict(client._to_dict()) == client
+
+
+def test_unbound_resource():
+    client = OAuth2Client._from_dict(client_payload("client"))
+    with pytest.raises(exceptions.UnboundResourceError):
+        client.delete()
+    with pytest.raises(exceptions.UnboundResourceError):
+        client.update(owner="owner")
+    login_request = LoginRequest._from_dict(
+        {
+            "challenge": "challenge",
+            "request_url": "http://localhost:4444/oauth2/auth",
+            "skip": False,
+            "subject": "",
+            "client": client_payload("client"),
+            "requested_scope": [],
+            "requested_access_token_audience": [],
+            "oidc_context": {},
+            "session_id": "session",
+        }
+    )
+    with pytest.raises(exceptions.UnboundResourceError):
+        login_request.accept("subject")
+
+
+def test_record_decoder():
+    payload = client_payload("client", redirect_uris=["http://a", "http://b"])
+    decode = OAuth2Client._record_decoder(["client_id", "updated_at", "jwks"])
+    record = decode(payload)
+    assert record._fields == ("client_id", "updated_at", "jwks")
+    assert record.client_id == "client"
+    assert record.updated_at == OAuth2Client._from_dict(payload).updated_at
+    assert record.jwks is None
+    # Decoders are cached per field list
+    assert OAuth2Client._record_decoder(("client_id", "updated_at", "jwks")) is decode
+
+
+def test_record_decoder_unknown_field():
+    with pytest.raises(TypeError):
+        OAuth2Client._record_decoder(["client_id", "unknown"])
+
+
+def test_record_decoder_missing_field():
+    payload = client_payload("client")
+    del payload["owner"]
+    with pytest.raises(TypeError):
+        OAuth2Client._record_decoder(["owner"])(payload)
+    assert OAuth2Client._record_decoder(["client_id"])(payload) == ("client",)
+
+
+def test_lazy_from_dict():
+    payload = client_payload("client")
+    with lazy():
+        client = OAuth2Client._from_dict(payload)
+    assert client.client_id == "client"
+    with pytest.raises(AttributeError):
+        object.__getattribute__(client, "updated_at")
+    assert client == OAuth2Client._from_dict(payload)
+    with pytest.raises(AttributeError):
+        client.unknown
@@ -1,7 +1,9 @@
+import json
+
 import pytest
 
 from hydra_client.oauth2 import OAuth2Client
-from hydra_client import exceptions
+from hydra_client import exceptions, HydraAdmin
 
 
 def test_client_list(hydra_admin, oauth2_client):
@@ -33,3 +35,141 @@ def test_client_delete(hydra_admin, oauth2_client):
     oauth2_client.delete()
     with pytest.raises(exceptions.NotFound):
         hydra_admin.client(oauth2_client.client_id)
+
+
+def test_iter_clients(fake_hydra_admin, fake_client_adapter):
+    client_iter = fake_hydra_admin.iter_clients(page_size=100)
+    first = next(client_iter)
+    assert isinstance(first, OAuth2Client)
+    assert first.client_id == "client-0000"
+    client_list = [first, *client_iter]
+    assert len(client_list) == 250
+    assert [c.client_id for c in client_list] == sorted(fake_client_adapter.clients)
+    assert len(fake_client_adapter.requests) == 3
+
+
+def test_iter_clients_exact_page(fake_hydra_admin, fake_client_adapter):
+    client_list = list(fake_hydra_admin.iter_clients(page_size=50))
+    assert len(client_list) == 250
+    # The last, empty page terminates the iteration
+    assert len(fake_client_adapter.requests) == 6
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_iter_clients_unpaginated(fake_hydra_admin, fake_client_adapter, concurrency):
+    fake_client_adapter.paginate = False
+    client_list = list(
+        fake_hydra_admin.export_clients(page_size=100, concurrency=concurrency)
+    )
+    # The first page holds all clients and ends the iteration
+    assert [c.client_id for c in client_list] == sorted(fake_client_adapter.clients)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_iter_clients_capped(fake_hydra_admin, fake_client_adapter, concurrency):
+    fake_client_adapter.max_limit = 100
+    client_list = list(
+        fake_hydra_admin.export_clients(page_size=200, concurrency=concurrency)
+    )
+    assert [c.client_id for c in client_list] == sorted(fake_client_adapter.clients)
+    client_list = list(fake_hydra_admin.iter_clients(page_size=200))
+    assert len(client_list) == 250
+
+
+def test_iter_clients_capped_single_page(fake_hydra_admin, fake_client_adapter):
+    # A first page that is shorter than requested might be capped, so the
+    # next offset is checked
+    fake_client_adapter.max_limit = 300
+    assert len(list(fake_hydra_admin.iter_clients(page_size=500))) == 250
+    assert len(fake_client_adapter.requests) == 2
+
+
+def test_clients_fields(fake_hydra_admin):
+    fields = ["client_id", "owner", "redirect_uris"]
+    client_list = fake_hydra_admin.clients(limit=5, fields=fields)
+    assert [c.client_id for c in client_list] == [
+        "client-{:04d}".format(i) for i in range(5)
+    ]
+    assert all(c._fields == tuple(fields) for c in client_list)
+    assert client_list[0].redirect_uris == ["http://client.localhost"]
+
+
+def test_iter_clients_fields(fake_hydra_admin):
+    client_ids = [c.client_id for c in fake_hydra_admin.clients()]
+    records = list(fake_hydra_admin.iter_clients(page_size=30, fields=["client_id"]))
+    assert records == [(client_id,) for client_id in client_ids]
+
+
+def test_client_fields(fake_hydra_admin):
+    record = fake_hydra_admin.client("client-0001", fields=["client_id", "owner"])
+    assert record == ("client-0001", "")
+
+
+def test_clients_raw(fake_hydra_admin, fake_client_adapter):
+    payload = fake_hydra_admin.clients_raw(limit=3)
+    assert payload == list(fake_client_adapter.clients.values())[:3]
+    body = fake_hydra_admin.client_raw("client-0001", raw="bytes")
+    assert json.loads(body) == fake_client_adapter.clients["client-0001"]
+    with pytest.raises(exceptions.NotFound):
+        fake_hydra_admin.client_raw("unknown", raw="bytes")
+    with pytest.raises(ValueError):
+        fake_hydra_admin.clients_raw(raw="xml")
+
+
+def test_clients_raw_global(fake_client_adapter):
+    hydra = HydraAdmin("http://localhost:4445", raw="bytes")
+    hydra.session_.mount("http://", fake_client_adapter)
+    body = hydra.client_raw("client-0001")
+    assert json.loads(body)["client_id"] == "client-0001"
+    assert hydra.client_raw("client-0001", raw="json")["client_id"] == "client-0001"
+    assert isinstance(hydra.client("client-0001"), OAuth2Client)
+
+
+def test_export_clients(fake_hydra_admin, fake_client_adapter):
+    client_list = list(fake_hydra_admin.export_clients(page_size=30, concurrency=4))
+    assert all(isinstance(c, OAuth2Client) for c in client_list)
+    assert [c.client_id for c in client_list] == sorted(fake_client_adapter.clients)
+
+
+def test_export_clients_ndjson(fake_hydra_admin, fake_client_adapter):
+    lines = list(fake_hydra_admin.export_clients(page_size=30, ndjson=True))
+    assert all(line.endswith("\n") for line in lines)
+    assert [json.loads(line) for line in lines] == list(
+        fake_client_adapter.clients.values()
+    )
+
+
+def test_create_clients(fake_hydra_admin, fake_client_adapter):
+    specs = [{"client_id": "new-{}".format(i)} for i in range(20)]
+    specs.insert(5, {"client_name": "missing id"})
+    results = fake_hydra_admin.create_clients(specs, concurrency=4)
+    assert len(results) == 21
+    assert isinstance(results.pop(5), exceptions.BadRequest)
+    assert [c.client_id for c in results] == [
+        s["client_id"] for s in specs if "client_id" in s
+    ]
+    assert all(c.client_id in fake_client_adapter.clients for c in results)
+
+
+def test_create_clients_malformed_spec(fake_hydra_admin, fake_client_adapter):
+    specs = [{"client_id": "new-0"}, {"client_id": "new-1", "unknown": 1}]
+    results = fake_hydra_admin.create_clients(specs, concurrency=2)
+    assert results[0].client_id == "new-0"
+    assert isinstance(results[1], TypeError)
+    assert "new-1" not in fake_client_adapter.clients
+
+
+def test_update_clients(fake_hydra_admin):
+    client_list = fake_hydra_admin.clients(limit=10)
+    results = fake_hydra_admin.update_clients(
+        [(c, {"client_name": c.client_id.upper()}) for c in client_list]
+    )
+    assert results == client_list
+    assert all(c.client_name == c.client_id.upper() for c in client_list)
+
+
+def test_delete_clients(fake_hydra_admin, fake_client_adapter):
+    results = fake_hydra_admin.delete_clients(["client-0000", "unknown", "client-0001"])
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], exceptions.NotFound)
+    assert "client-0000" not in fake_client_adapter.clients
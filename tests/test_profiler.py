@@ -0,0 +1,74 @@
+import itertools
+import time
+
+import pytest
+
+from hydra_client import HydraAdmin
+from hydra_client import profiler as profiler_module
+from hydra_client.profiler import CallProfile, CallProfiler, PHASES
+
+
+@pytest.fixture
+def profiler():
+    return CallProfiler(sample_rate=1.0)
+
+
+@pytest.fixture
+def profiled_admin(fake_client_adapter, profiler):
+    hydra = HydraAdmin("http://localhost:4445", profiler=profiler)
+    hydra.session_.mount("http://", fake_client_adapter)
+    return hydra
+
+
+def test_call_profile_exclusive(monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(profiler_module.time, "perf_counter", lambda: next(clock))
+    profile = CallProfile("call")
+    profile.push("construct")  # 0
+    profile.push("convert")  # 1
+    profile.push("construct")  # 2
+    profile.pop()  # 3
+    profile.pop()  # 4
+    profile.pop()  # 5
+    assert profile.phases["construct"] == 3
+    assert profile.phases["convert"] == 2
+    assert profile.phases["network"] == 0
+
+
+def test_profile_consent_sessions(profiled_admin, profiler):
+    session_list = []
+    for consent_session in profiled_admin.consent_sessions("foobar"):
+        # Time spent by the caller isn't attributed to the call
+        time.sleep(0.01)
+        session_list.append(consent_session)
+    assert len(session_list) == 25
+    assert profiler.calls == {"consent_sessions": 1}
+    phases = profiler.totals["consent_sessions"]
+    assert all(phases[phase] > 0 for phase in PHASES)
+    assert sum(phases.values()) < 0.25
+
+
+def test_profile_calls(profiled_admin, profiler):
+    profiled_admin.clients(limit=10)
+    profiled_admin.client("client-0001")
+    profiled_admin.version()
+    assert profiler.calls == {"clients": 1, "client": 1, "version": 1}
+    assert profiler.totals["version"]["network"] > 0
+    assert profiler.totals["version"]["construct"] == 0
+    report = profiler.report()
+    assert report.splitlines()[0].split() == ["call", "samples", "mean", "ms"] + list(
+        PHASES
+    )
+    assert [line.split()[:2] for line in report.splitlines()[1:]] == [
+        ["client", "1"],
+        ["clients", "1"],
+        ["version", "1"],
+    ]
+
+
+def test_profile_sampling(fake_client_adapter):
+    profiler = CallProfiler(sample_rate=0.0)
+    hydra = HydraAdmin("http://localhost:4445", profiler=profiler)
+    hydra.session_.mount("http://", fake_client_adapter)
+    hydra.clients(limit=10)
+    assert not profiler.calls
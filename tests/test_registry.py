@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from hydra_client.oauth2 import OAuth2Client
+from hydra_client.registry import OAuth2ClientRegistry
+
+
+@pytest.fixture
+def registry(fake_hydra_admin):
+    return OAuth2ClientRegistry(fake_hydra_admin, interval=0.01, page_size=100)
+
+
+def test_registry_refresh(registry, fake_client_adapter):
+    changes = []
+    registry.subscribe(lambda old, new: changes.append((old, new)))
+    registry.refresh()
+    assert len(registry) == 250
+    assert len(changes) == 250
+    assert all(old is None for old, _ in changes)
+
+    client = registry.get("client-0000")
+    fake_client_adapter.clients["client-0001"]["updated_at"] = "2020-01-01T00:00:00Z"
+    del fake_client_adapter.clients["client-0002"]
+    changes.clear()
+    registry.refresh()
+    assert registry.get("client-0000") is client
+    assert "client-0002" not in registry
+    assert [(o and o.client_id, n and n.client_id) for o, n in changes] == [
+        ("client-0001", "client-0001"),
+        ("client-0002", None),
+    ]
+
+
+def test_registry_refresh_decodes_changes(registry, fake_client_adapter, monkeypatch):
+    registry.refresh()
+    fake_client_adapter.clients["client-0001"]["updated_at"] = "2020-01-01T00:00:00Z"
+    decoded = []
+    from_dict = OAuth2Client._from_dict
+
+    def counting_from_dict(data, parent=None):
+        decoded.append(data["client_id"])
+        return from_dict(data, parent)
+
+    monkeypatch.setattr(OAuth2Client, "_from_dict", counting_from_dict)
+    registry.refresh()
+    assert decoded == ["client-0001"]
+
+
+def test_registry_lookup_offline(registry, fake_client_adapter):
+    registry.refresh()
+    request_count = len(fake_client_adapter.requests)
+    assert registry.get("client-0042").client_id == "client-0042"
+    assert registry.get("unknown") is None
+    assert len(list(registry)) == 250
+    assert len(fake_client_adapter.requests) == request_count
+
+
+def test_registry_background_refresh(registry, fake_client_adapter):
+    registry.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(registry) < 250 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(registry) == 250
+    finally:
+        registry.stop()
+
+
+def test_registry_callback_errors(registry, caplog):
+    def failing(old, new):
+        raise ValueError(new.client_id)
+
+    changes = []
+    registry.subscribe(failing)
+    registry.subscribe(lambda old, new: changes.append(new))
+    registry.refresh()
+    assert len(registry) == 250
+    assert len(changes) == 250
+    assert "callback" in caplog.records[0].getMessage()
+
+
+def test_registry_background_refresh_errors(registry, monkeypatch):
+    calls = []
+
+    def refresh():
+        calls.append(None)
+        raise ValueError("undecodable")
+
+    monkeypatch.setattr(registry, "refresh", refresh)
+    registry.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(calls) >= 2
+    finally:
+        registry.stop()
+
+
+def test_registry_refresh_capped(fake_hydra_admin, fake_client_adapter):
+    # Clients beyond the server's page size limit aren't treated as deleted
+    fake_client_adapter.max_limit = 100
+    registry = OAuth2ClientRegistry(fake_hydra_admin, page_size=500)
+    registry.refresh()
+    assert len(registry) == 250
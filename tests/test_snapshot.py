@@ -0,0 +1,34 @@
+from hydra_client.oauth2 import OAuth2Client
+from hydra_client.registry import OAuth2ClientRegistry
+from hydra_client.snapshot import ClientSnapshot
+
+
+def test_snapshot_roundtrip(tmp_path, fake_hydra_admin):
+    client_list = fake_hydra_admin.clients()
+    snapshot = ClientSnapshot(str(tmp_path / "clients.db"))
+    snapshot.save(client_list, "v1.0.0")
+    assert snapshot.version == "v1.0.0"
+    assert snapshot.created_at is not None
+    loaded = list(snapshot.load(fake_hydra_admin))
+    assert all(isinstance(c, OAuth2Client) for c in loaded)
+    assert all(c.parent_ is fake_hydra_admin for c in loaded)
+    assert sorted(loaded, key=lambda c: c.client_id) == client_list
+
+
+def test_registry_snapshot(tmp_path, fake_hydra_admin, fake_client_adapter):
+    path = str(tmp_path / "clients.db")
+    registry = OAuth2ClientRegistry(fake_hydra_admin)
+    registry.refresh()
+    registry.save_snapshot(path)
+
+    fake_client_adapter.requests.clear()
+    fake_client_adapter.clients["client-0001"]["updated_at"] = "2020-01-01T00:00:00Z"
+    warm_registry = OAuth2ClientRegistry(fake_hydra_admin)
+    warm_registry.load_snapshot(path)
+    assert len(warm_registry) == 250
+    assert not fake_client_adapter.requests
+
+    changes = []
+    warm_registry.subscribe(lambda old, new: changes.append(new.client_id))
+    warm_registry.refresh()
+    assert changes == ["client-0001"]
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from hydra_client import exceptions
+from hydra_client.testing import (
+    CassetteReplay,
+    FakeHydra,
+    login_consent_flow,
+    main,
+    run_load,
+    UnmatchedRequest,
+)
+
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes")
+CHALLENGE = "af3f599180ca41acad0514326176c03d"
+
+
+def cassette(name):
+    return os.path.join(CASSETTES, name + ".json")
+
+
+@pytest.fixture
+def fake_hydra():
+    fake = FakeHydra()
+    fake.add_client("test-client")
+    return fake
+
+
+def test_login_consent_flow(fake_hydra):
+    hydra = fake_hydra.admin()
+    login_consent_flow(hydra, fake_hydra, "test-client", "foobar")
+    assert not fake_hydra.login_requests
+    assert not fake_hydra.consent_requests
+    (consent_session,) = hydra.consent_sessions("foobar")
+    assert consent_session.consent_request.subject == "foobar"
+    assert consent_session.consent_request.client.client_id == "test-client"
+    assert consent_session.grant_scope == ["openid", "offline"]
+    hydra.revoke_consent_sessions("foobar", client="test-client")
+    assert list(hydra.consent_sessions("foobar")) == []
+
+
+def test_handled_requests(fake_hydra):
+    hydra = fake_hydra.admin()
+    login_request = hydra.login_request(fake_hydra.start_login("test-client"))
+    assert "error=access_denied" in login_request.reject()
+    with pytest.raises(exceptions.NotFound):
+        login_request.accept(subject="foobar")
+    with pytest.raises(exceptions.NotFound):
+        hydra.consent_request("unknown")
+
+
+def test_logout(fake_hydra):
+    hydra = fake_hydra.admin()
+    login_consent_flow(hydra, fake_hydra, "test-client", "foobar")
+    logout_request = hydra.logout_request(fake_hydra.start_logout("foobar"))
+    assert logout_request.subject == "foobar"
+    assert logout_request.sid
+    logout_request.accept(subject="foobar")
+    assert "foobar" not in fake_hydra.login_sessions
+
+
+def test_clients(fake_hydra):
+    hydra = fake_hydra.admin()
+    client = hydra.create_client(client_id="other-client", client_name="Other")
+    assert hydra.client("other-client").client_name == "Other"
+    assert [c.client_id for c in hydra.clients()] == ["test-client", "other-client"]
+    client.delete()
+    with pytest.raises(exceptions.NotFound):
+        hydra.client("other-client")
+    assert hydra.version() == "v1.0.0"
+
+
+def test_run_load(fake_hydra):
+    report = run_load(fake_hydra.admin(), fake_hydra, flows=20, concurrency=4)
+    assert report.errors == 0
+    assert len(report.latencies) == 20
+    assert report.percentile(50) <= report.percentile(99)
+    assert report.throughput > 0
+    assert len(fake_hydra.consent_sessions) == 20
+
+
+def test_main(capsys):
+    assert main(["--flows", "10", "--concurrency", "2"]) == 0
+    assert "10 flows (0 errors)" in capsys.readouterr().out
+
+
+def test_cassette_replay():
+    replay = CassetteReplay(cassette("test_login.test_login_request_accept"))
+    hydra = replay.admin()
+    for _ in range(3):
+        login_request = hydra.login_request(CHALLENGE)
+        assert login_request.challenge == CHALLENGE
+        assert login_request.client.client_id == "test-client"
+        redirect = login_request.accept(subject="foobar")
+        assert redirect.startswith("http://localhost:4444/oauth2/auth?")
+
+
+def test_cassette_replay_multiple():
+    replay = CassetteReplay(
+        cassette("test_consent.test_list_consent_sessions"),
+        cassette("test_version.test_hydra_version"),
+    )
+    hydra = replay.admin()
+    session_list = list(hydra.consent_sessions("foobar", None))
+    assert session_list
+    assert all(s.consent_request.subject == "foobar" for s in session_list)
+    assert hydra.version() == "v1.0.0-rc.15+oryOS.12"
+
+
+def test_cassette_replay_once():
+    replay = CassetteReplay(
+        cassette("test_login.test_login_request_accept"), repeat=False
+    )
+    hydra = replay.admin()
+    hydra.login_request(CHALLENGE)
+    with pytest.raises(UnmatchedRequest):
+        hydra.login_request(CHALLENGE)
+    replay.rewind()
+    hydra.login_request(CHALLENGE)
+    with pytest.raises(UnmatchedRequest):
+        hydra.login_request("unknown")
+
+
+def test_cassette_replay_ignores_proxies(monkeypatch):
+    monkeypatch.setenv("HTTP_PROXY", "http://proxy.invalid:3128")
+    hydra = CassetteReplay(cassette("test_version.test_hydra_version")).admin()
+    assert not hydra.session_.trust_env
+    assert hydra.version() == "v1.0.0-rc.15+oryOS.12"
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+
+import dateutil.parser
+import pytest
+
+from hydra_client.utils import parse_datetime
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2019-06-11T19:32:34Z",
+        "2019-06-11T19:32:34.5Z",
+        "2019-06-11t19:32:34z",
+        "2019-06-11T21:32:34+02:00",
+        "2019-06-11T19:32:34.001-05:30",
+    ],
+)
+def test_parse_datetime_rfc3339(value):
+    parsed = parse_datetime(value)
+    assert parsed == dateutil.parser.parse(value)
+    assert parsed.utcoffset() is not None
+
+
+def test_parse_datetime_nanoseconds():
+    parsed = parse_datetime("2019-06-11T19:32:34.123456789Z")
+    assert parsed == datetime(2019, 6, 11, 19, 32, 34, 123456, timezone.utc)
+
+
+def test_parse_datetime_offset():
+    parsed = parse_datetime("2019-06-11T19:32:34-05:30")
+    assert parsed.utcoffset() == -timedelta(hours=5, minutes=30)
+
+
+def test_parse_datetime_fallback():
+    assert parse_datetime("June 11 2019 19:32") == datetime(2019, 6, 11, 19, 32)
+
+
+def test_parse_datetime_passthrough():
+    now = datetime.now(timezone.utc)
+    assert parse_datetime(now) is now